@@ -1,8 +1,10 @@
 import os
 import logging
+import contextlib
 import concurrent.futures
 
-from .ingestion_utils import generate_sequence_output_paths
+from .ingestion_utils import generate_sequence_output_paths, IngestionError
+from .ingestion_profiling import span
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
@@ -10,13 +12,30 @@ logging.basicConfig(
 
 
 class SequenceBuilder:
-    def __init__(self, sequence, copy_op, proxy_op, mov_op):
+    def __init__(self, sequence, copy_op, proxy_op, mov_op, executor=None, num_workers=None, router=None, validate_op=None):
         self.sequence = sequence  # dict with 'paths' key
         self.copy_op = copy_op
         self.proxy_op = proxy_op
         self.mov_op = mov_op
+        self.validate_op = validate_op
+        self.executor = executor  # shared frame pool, a private one is created per call if None
+        self.router = router  # ExecutorRouter running per-frame proxy and validation work
+        self.num_workers = num_workers or os.cpu_count() or 4  # Fallback to 4 if detection fails
+        self.proxy_fmt = None
         self.copied_paths = []
         self.out_paths = {}
+        self.checksums = {}  # copied frame -> checksum, filled by validate_frames
+        self.stage = None  # operation build() is running, reported when it fails
+
+    def run_per_frame(self, op, calls):
+        """
+        Runs an operation over per-frame argument tuples on the router's backend
+        for that operation, or on a private thread pool without a router.
+        """
+        if self.router:
+            return self.router.map(op, calls)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            return list(executor.map(lambda args: op.execute(*args), calls))
 
     def copy_sequence(self, metadata):
         copied = []
@@ -26,64 +45,101 @@ class SequenceBuilder:
             logging.error("No valid sequence paths found.")
             return  
         frame_counter = start_frame
-        tasks = []
-
-        num_workers = os.cpu_count() or 4  # Fallback to 4 if detection fails
 
-        out_paths = {}
-        for src in sorted(self.sequence['paths']):
-            out  = generate_sequence_output_paths(self.sequence, metadata, frame_number=frame_counter, ext='exr')
-            if not out:
-                logging.error("Failed to generate output paths for the sequence.")
-                return
-            out_paths[src]  = out
-            frame_counter += 1  
-        
-        logging.info(f"Output paths generated: {out_paths}")
+        # Output paths are generated as frames are submitted and at most
+        # max_in_flight copies are pending, whatever the length of the sequence.
+        max_in_flight = self.num_workers * 2
+        pending = set()
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
-            for src in sorted(self.sequence['paths']):
-                _, ext = os.path.splitext(os.path.basename(src))
-                plate_path = out_paths[src]['plate']
+        if self.executor:
+            pool = contextlib.nullcontext(self.executor)
+        else:
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.num_workers)
+        with pool as executor:
+            # Sequence paths are already in frame order
+            for src in self.sequence['paths']:
+                with span("output_paths"):
+                    out = generate_sequence_output_paths(self.sequence, metadata, frame_number=frame_counter, ext='exr')
+                if not out:
+                    logging.error("Failed to generate output paths for the sequence.")
+                    break
+                frame_counter += 1
+                plate_path = out['plate']
+                if not copied:
+                    self.out_paths = out
+                    logging.info(f"Output paths generated: {src} -> {plate_path} ...")
+                if len(pending) >= max_in_flight:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
                 # Submit each copy as a parallel task
-                tasks.append(executor.submit(self.copy_op.execute, src, plate_path, overwrite))
+                pending.add(executor.submit(self.copy_op.execute, src, plate_path, overwrite))
                 copied.append(plate_path)
-               
+
             # Wait for all copies to finish
-            for task in concurrent.futures.as_completed(tasks):
+            for task in concurrent.futures.as_completed(pending):
                 task.result()
         self.copied_paths = copied
+        if not copied:
+            return
 
         # Feedback after all files in the sequence are copied
-        folder_name = os.path.dirname(plate_path)
+        folder_name = os.path.dirname(copied[-1])
         logging.info(f"Copy complete for sequence in folder: {folder_name} ({len(self.copied_paths)} files)")
 
-    def generate_proxies(self):
-        if not self.copied_paths:
+    def validate_frames(self):
+        """
+        Validates the copied frames and records their checksums.
+
+        Raises:
+            IngestionError: If any copied frame is unreadable or truncated.
+        """
+        if not self.copied_paths or not self.validate_op:
+            return
+        with span("validate"):
+            results = self.run_per_frame(self.validate_op, [(path,) for path in self.copied_paths])
+        self.checksums = {result['path']: result['checksum'] for result in results}
+        invalid = [result for result in results if not result['valid']]
+        if invalid:
+            for result in invalid:
+                logging.error(f"Invalid frame {result['path']}: {result['error']}")
+            raise IngestionError(f"{len(invalid)} of {len(results)} frames failed validation in {os.path.dirname(self.copied_paths[0])}")
+        logging.info(f"Validated {len(results)} frames in {os.path.dirname(self.copied_paths[0])}")
+
+    def generate_proxies(self, fmt=None):
+        fmt = fmt or self.proxy_fmt
+        if not self.copied_paths or not fmt:
             return
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = []
-            for exr_path in self.copied_paths:
-                proxy_path = os.path.join(self.out_paths['proxy'], os.path.basename(exr_path).replace('.exr', f'.{self.proxy_fmt}'))
-                futures.append(executor.submit(self.proxy_op.execute, exr_path, proxy_path, self.proxy_fmt))
-            for future in concurrent.futures.as_completed(futures):
-                future.result()
+        calls = [
+            (exr_path, os.path.join(self.out_paths['proxy'], os.path.basename(exr_path).replace('.exr', f'.{fmt}')), fmt)
+            for exr_path in self.copied_paths
+        ]
+        with span("proxy"):
+            self.run_per_frame(self.proxy_op, calls)
 
     def generate_mov(self):
         if not self.copied_paths:
             return
         pattern = self.copied_paths[0].replace('1001', '%04d')  # adjust as needed
         mov_path = os.path.join(self.out_paths['mov'], os.path.basename(pattern).replace('exr', 'mov'))
-        self.mov_op.execute(pattern, mov_path)
+        with span("mov"):
+            self.mov_op.execute(pattern, mov_path)
 
     def build(self, parallel_proxy=False, metadata= None):
+        self.proxy_fmt = metadata.get('proxy_format')
+        self.stage = "copy"
         self.copy_sequence(metadata)
+        if metadata.get('validate'):
+            self.stage = "validate"
+            self.validate_frames()
         if metadata.get('proxy_format') and parallel_proxy:
             with concurrent.futures.ThreadPoolExecutor() as executor:
                 executor.submit(self.generate_proxies, metadata.get('proxy_format'))
                 executor.submit(self.generate_mov)
         else:
             if metadata.get('proxy'):
+                self.stage = "proxy"
                 self.generate_proxies()
             if metadata.get('mov'):
+                self.stage = "mov"
                 self.generate_mov()
\ No newline at end of file
@@ -0,0 +1,111 @@
+import time
+import logging
+import threading
+import contextlib
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
+)
+
+
+class AdaptiveConcurrencyController:
+    """
+    Limits the number of copies in flight and tunes that limit while copying.
+
+    Every interval the aggregate bytes/s of the finished copies is compared with
+    the previous interval and the limit is moved by one step (hill climbing):
+    keep going while throughput improves, turn around when it drops, and step
+    down when it is flat so the run settles at the smallest limit that reaches
+    the storage's throughput knee.
+    """
+    def __init__(self, min_workers=1, max_workers=8, initial=None, interval=2.0, tolerance=0.05):
+        """
+        Args:
+            min_workers (int, optional): Lower bound of the limit. Defaults to 1.
+            max_workers (int, optional): Upper bound of the limit. Defaults to 8.
+            initial (int, optional): Starting limit. Defaults to the middle of the bounds.
+            interval (float, optional): Seconds of copying between adjustments. Defaults to 2.
+            tolerance (float, optional): Relative throughput change treated as flat. Defaults to 5%.
+        """
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers)
+        self.limit = initial or (self.min_workers + self.max_workers) // 2
+        self.limit = min(max(self.limit, self.min_workers), self.max_workers)
+        self.interval = interval
+        self.tolerance = tolerance
+        self.decisions = []  # (time, old limit, new limit, bytes/s, mean latency)
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._direction = 1
+        self._last_throughput = None
+        self._best_throughput = 0.0
+        self._reset_window(time.monotonic())
+
+    def _reset_window(self, now):
+        self._window_start = now
+        self._window_bytes = 0
+        self._window_latency = 0.0
+        self._window_count = 0
+
+    @contextlib.contextmanager
+    def slot(self):
+        """Blocks until a copy may start, then holds one in-flight slot."""
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def record(self, nbytes, seconds):
+        """
+        Records a finished copy and adjusts the limit once per interval.
+
+        Args:
+            nbytes (int): Bytes copied.
+            seconds (float): Time the copy took.
+        """
+        with self._cond:
+            self._window_bytes += nbytes
+            self._window_latency += seconds
+            self._window_count += 1
+            now = time.monotonic()
+            if now - self._window_start >= self.interval:
+                self._adjust(now)
+
+    def _adjust(self, now):
+        elapsed = now - self._window_start
+        throughput = self._window_bytes / elapsed if elapsed > 0 else 0.0
+        latency = self._window_latency / self._window_count if self._window_count else 0.0
+        last = self._last_throughput
+        if last is not None:
+            if throughput < last * (1 - self.tolerance):
+                self._direction = -self._direction
+            elif throughput <= last * (1 + self.tolerance):
+                # Flat: more copies buy nothing, so prefer fewer.
+                self._direction = -1
+        old = self.limit
+        self.limit = min(max(old + self._direction, self.min_workers), self.max_workers)
+        if self.limit == old:
+            self._direction = -self._direction
+        self._last_throughput = throughput
+        self._best_throughput = max(self._best_throughput, throughput)
+        self.decisions.append((now, old, self.limit, throughput, latency))
+        logging.info(
+            f"Concurrency {old} -> {self.limit}: {throughput / 1024 ** 2:.1f} MiB/s, "
+            f"{latency * 1000:.0f} ms per file over {self._window_count} files"
+        )
+        self._reset_window(now)
+        self._cond.notify_all()
+
+    def summary(self):
+        """Logs the final limit and the best throughput seen."""
+        logging.info(
+            f"Concurrency settled at {self.limit} copies (bounds {self.min_workers}-{self.max_workers}, "
+            f"{len(self.decisions)} adjustments, best {self._best_throughput / 1024 ** 2:.1f} MiB/s)"
+        )
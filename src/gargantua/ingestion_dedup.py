@@ -0,0 +1,175 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+
+from .ingestion_io import PARTIAL_SUFFIX
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
+)
+
+PARTIAL_HASH_BYTES = 64 * 1024
+FULL_HASH_BLOCK = 1024 * 1024
+DEDUP_MODES = ("link", "skip")
+
+
+def partial_hash(path, size=None):
+    """
+    Hashes the head and tail of a file. Cheap enough to compute for every frame,
+    and together with the size it rules out almost every non-duplicate.
+
+    Args:
+        path (str): The file to hash.
+        size (int, optional): The file size, if already known.
+
+    Returns:
+        str: The hex digest.
+    """
+    size = os.path.getsize(path) if size is None else size
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        digest.update(f.read(PARTIAL_HASH_BYTES))
+        if size > PARTIAL_HASH_BYTES:
+            f.seek(max(PARTIAL_HASH_BYTES, size - PARTIAL_HASH_BYTES))
+            digest.update(f.read(PARTIAL_HASH_BYTES))
+    return digest.hexdigest()
+
+
+def full_hash(path):
+    """
+    Hashes the whole file.
+
+    Args:
+        path (str): The file to hash.
+
+    Returns:
+        str: The hex digest.
+    """
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(FULL_HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ContentIndex:
+    """
+    A local index of ingested files keyed by size and partial hash. Full hashes
+    are only computed when two files share a key, and are cached in the index.
+    """
+    def __init__(self, path):
+        """
+        Initializes the index and loads it from disk if it exists.
+
+        Args:
+            path (str): The JSON file backing the index.
+        """
+        self.path = path
+        self.entries = {}  # "size:partial" -> {path: full hash or None}
+        self.keys = {}  # path -> its "size:partial" key, to drop the entry of an overwritten file
+        self._lock = threading.Lock()
+        self.loaded = False
+        if os.path.isfile(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as index_file:
+                    self.entries = json.load(index_file).get('files', {})
+                self.keys = {path: key for key, paths in self.entries.items() for path in paths}
+                self.loaded = True
+            except (OSError, ValueError) as e:
+                logging.warning(f"Could not read content index {path}, rebuilding: {e}")
+
+    def save(self):
+        """Writes the index atomically."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as index_file:
+                json.dump({'files': self.entries}, index_file)
+            os.replace(tmp_path, self.path)
+
+    def add(self, path, size=None, partial=None, full=None):
+        """
+        Adds a file to the index, replacing the entry of an earlier file at the
+        same path so a cached full hash never outlives the content it describes.
+
+        Args:
+            path (str): The ingested file.
+            size (int, optional): Its size, if already known.
+            partial (str, optional): Its partial hash, if already known.
+            full (str, optional): Its full hash, if already known.
+        """
+        size = os.path.getsize(path) if size is None else size
+        partial = partial_hash(path, size) if partial is None else partial
+        key = f"{size}:{partial}"
+        with self._lock:
+            old_key = self.keys.get(path)
+            if old_key is not None and old_key != key:
+                self.discard(old_key, path)
+            self.entries.setdefault(key, {})[path] = full
+            self.keys[path] = key
+
+    def discard(self, key, path):
+        """Drops the entry of path under key. Callers hold the lock."""
+        paths = self.entries.get(key, {})
+        paths.pop(path, None)
+        if not paths:
+            self.entries.pop(key, None)
+        if self.keys.get(path) == key:
+            del self.keys[path]
+
+    def build(self, root):
+        """
+        Indexes every file under root, e.g. the plates of earlier ingests.
+
+        Args:
+            root (str): The folder to index.
+
+        Returns:
+            int: The number of files indexed.
+        """
+        count = 0
+        for dir_path, _, files in os.walk(root):
+            for file_name in files:
+                if file_name.endswith(PARTIAL_SUFFIX):
+                    continue
+                try:
+                    self.add(os.path.join(dir_path, file_name))
+                    count += 1
+                except OSError as e:
+                    logging.warning(f"Could not index {file_name}: {e}")
+        return count
+
+    def find(self, src):
+        """
+        Looks for an indexed file with the same content as src.
+
+        Args:
+            src (str): The incoming file.
+
+        Returns:
+            tuple: (duplicate path or None, size, partial hash, full hash or None).
+        """
+        size = os.path.getsize(src)
+        partial = partial_hash(src, size)
+        key = f"{size}:{partial}"
+        with self._lock:
+            candidates = list(self.entries.get(key, {}).items())
+        src_full = None
+        for path, candidate_full in candidates:
+            if not os.path.isfile(path) or os.path.getsize(path) != size:
+                with self._lock:
+                    self.discard(key, path)
+                continue
+            if src_full is None:
+                src_full = full_hash(src)
+            if candidate_full is None:
+                candidate_full = full_hash(path)
+                with self._lock:
+                    if self.keys.get(path) == key:
+                        self.entries[key][path] = candidate_full
+            if candidate_full == src_full:
+                return path, size, partial, src_full
+        return None, size, partial, src_full
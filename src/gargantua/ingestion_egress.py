@@ -0,0 +1,152 @@
+import os
+import logging
+import tarfile
+import contextlib
+
+from .ingestion_manifest import FileManifest, file_signature
+from .ingestion_io import PARTIAL_SUFFIX
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
+)
+
+EGRESS_FORMATS = ("copy", "tar")
+EGRESS_MANIFEST_NAME = ".egress_manifest.json"
+PLATE_REGISTRY_NAME = "plate_folders.json"  # folders ingest wrote plates to, under <destination>/.gargantua
+
+
+class EgressPackager:
+    """
+    Sends the files that changed since the last egress to a vendor into
+    vault/from_mvl/<vendor>/<date>, either as plain copies or as a single tar
+    written in one sequential pass.
+    """
+    def __init__(self, source_root, vendor_root, date_str, copy_op, fmt="copy"):
+        """
+        Args:
+            source_root (str): The pipeline folder egress paths are relative to (work/sequences).
+            vendor_root (str): The vault/from_mvl/<vendor> folder.
+            date_str (str): The delivery date as YYYYMMDD.
+            copy_op (CopyFileOperation): Operation used for plain copies.
+            fmt (str, optional): "copy" or "tar". Defaults to "copy".
+        """
+        if fmt not in EGRESS_FORMATS:
+            raise ValueError(f"Unsupported egress format: {fmt}")
+        self.source_root = source_root
+        self.vendor_root = vendor_root
+        self.date_str = date_str
+        self.copy_op = copy_op
+        self.fmt = fmt
+        self.manifest = FileManifest(os.path.join(vendor_root, EGRESS_MANIFEST_NAME))
+
+    def collect_delta(self, sub_paths=None, excluded_folders=()):
+        """
+        Walks the selected folders and returns the files that are new or changed
+        since the last egress to this vendor.
+
+        Args:
+            sub_paths (list, optional): Folders relative to source_root (e.g. SC_48/SH_0160).
+                Defaults to the whole source_root.
+            excluded_folders (set, optional): Folders relative to source_root left out,
+                e.g. the plate folders ingest wrote to.
+
+        Returns:
+            tuple: (delta, unchanged) where delta is a list of (path, relative path, signature)
+                   in path order and unchanged the number of files skipped.
+        """
+        delta = []
+        unchanged = 0
+        for sub_path in sub_paths or [""]:
+            start = os.path.join(self.source_root, sub_path)
+            if not os.path.isdir(start):
+                logging.warning(f"Egress path not found: {start}")
+                continue
+            if os.path.relpath(start, self.source_root).replace(os.sep, '/') in excluded_folders:
+                continue
+            for root, dirs, files in os.walk(start):
+                rel_root = os.path.relpath(root, self.source_root).replace(os.sep, '/')
+                prefix = "" if rel_root == "." else f"{rel_root}/"
+                dirs[:] = sorted(name for name in dirs if f"{prefix}{name}" not in excluded_folders)
+                for file_name in sorted(files):
+                    if file_name.endswith(PARTIAL_SUFFIX):
+                        continue
+                    path = os.path.join(root, file_name)
+                    rel_path = os.path.relpath(path, self.source_root).replace(os.sep, '/')
+                    signature = file_signature(path)
+                    if self.manifest.is_changed(rel_path, signature):
+                        delta.append((path, rel_path, signature))
+                    else:
+                        unchanged += 1
+        return delta, unchanged
+
+    def write(self, delta, package_name):
+        """
+        Writes the delta into the dated vendor folder and records it in the manifest.
+
+        Args:
+            delta (list): Files returned by collect_delta.
+            package_name (str): Base name of the tar package.
+
+        Returns:
+            str: The folder or tar file written, or None if there was nothing to send.
+        """
+        if not delta:
+            return None
+        date_path = os.path.join(self.vendor_root, self.date_str)
+        os.makedirs(date_path, exist_ok=True)
+        if self.fmt == "tar":
+            target = self._write_tar(delta, date_path, package_name)
+            self.manifest.save()
+            return target
+        try:
+            return self._write_copies(delta, date_path)
+        finally:
+            # Copies that landed stay valid even if a later one fails.
+            self.manifest.save()
+
+    def _write_copies(self, delta, date_path):
+        for path, rel_path, signature in delta:
+            self.copy_op.execute(path, os.path.join(date_path, *rel_path.split('/')), True)
+            self.manifest.update(rel_path, signature)
+        return date_path
+
+    def _write_tar(self, delta, date_path, package_name):
+        tar_path = os.path.join(date_path, f"{package_name}.tar")
+        index = 1
+        while os.path.exists(tar_path):
+            index += 1
+            tar_path = os.path.join(date_path, f"{package_name}_{index}.tar")
+        # Written under a temporary name, a failed egress leaves no truncated package
+        tmp_path = f"{tar_path}{PARTIAL_SUFFIX}"
+        try:
+            # "w|" streams uncompressed blocks: one sequential pass, no seeking back.
+            with tarfile.open(tmp_path, "w|") as tar:
+                for path, rel_path, _ in delta:
+                    tar.add(path, arcname=rel_path, recursive=False)
+            os.replace(tmp_path, tar_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+        for path, rel_path, signature in delta:
+            self.manifest.update(rel_path, signature)
+        logging.info(f"Egress package written: {tar_path}")
+        return tar_path
+
+
+def summarize_delta(delta):
+    """
+    Groups an egress delta by version folder.
+
+    Args:
+        delta (list): Files returned by EgressPackager.collect_delta.
+
+    Returns:
+        dict: version folder (relative path) -> number of changed files.
+    """
+    versions = {}
+    for _, rel_path, _ in delta:
+        version = rel_path.rsplit('/', 1)[0] if '/' in rel_path else '.'
+        versions[version] = versions.get(version, 0) + 1
+    return versions
@@ -0,0 +1,144 @@
+import os
+import pickle
+import logging
+import threading
+import multiprocessing
+import concurrent.futures
+
+from .ingestion_utils import split_list
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
+)
+
+BACKENDS = ("thread", "process")
+DEFAULT_BATCH_SIZE = 32  # frames sent to a worker process per task
+PROCESS_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def run_batch(op, calls):
+    """
+    Runs an operation over a batch of argument tuples. Module level so process
+    pools can pickle it.
+
+    Args:
+        op (FileOperation): The operation.
+        calls (list): Argument tuples for op.execute.
+
+    Returns:
+        list: The results, in call order.
+    """
+    return [op.execute(*args) for args in calls]
+
+
+def parse_backends(value):
+    """
+    Parses a backend selection like "validate=process,proxy=thread".
+
+    Args:
+        value (str or dict): The selection.
+
+    Returns:
+        dict: operation name -> backend.
+
+    Raises:
+        ValueError: On an unknown backend or a malformed entry.
+    """
+    if isinstance(value, dict):
+        backends = dict(value)
+    else:
+        backends = {}
+        for item in split_list(value):
+            name, sep, backend = item.partition('=')
+            if not sep:
+                raise ValueError(f"Expected <operation>=<backend>, got {item}")
+            backends[name.strip()] = backend.strip()
+    for name, backend in backends.items():
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend} for {name}, use one of {', '.join(BACKENDS)}")
+    return backends
+
+
+class ExecutorRouter:
+    """
+    Runs FileOperation calls on a thread pool or a process pool, chosen per
+    operation type.
+
+    Operations default to the process pool when their class sets cpu_bound and
+    to threads otherwise, so GIL-bound per-frame Python work runs in parallel
+    while I/O-bound copies stay on threads. Process work is sent in batches of
+    consecutive frames to amortize pickling.
+    """
+    def __init__(self, backends=None, max_workers=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            backends (dict, optional): operation name -> "thread" or "process".
+            max_workers (int, optional): Size of each pool. Defaults to the CPU count.
+            batch_size (int, optional): Frames per process task. Defaults to DEFAULT_BATCH_SIZE.
+        """
+        self.backends = parse_backends(backends or {})
+        self.max_workers = max_workers or os.cpu_count() or 4
+        self.batch_size = max(1, batch_size)
+        self._threads = None
+        self._processes = None
+        self._unpicklable = set()
+        self._lock = threading.Lock()
+
+    def backend_for(self, op):
+        """Returns "thread" or "process" for an operation."""
+        backend = self.backends.get(op.name, "process" if op.cpu_bound else "thread")
+        if backend == "process" and type(op) not in self._unpicklable:
+            try:
+                pickle.dumps(op)
+            except Exception as e:
+                logging.warning(f"{type(op).__name__} cannot run in a process pool, using threads: {e}")
+                with self._lock:
+                    self._unpicklable.add(type(op))
+        if type(op) in self._unpicklable:
+            return "thread"
+        return backend
+
+    def _pool(self, backend):
+        with self._lock:
+            if backend == "process":
+                if self._processes is None:
+                    # The pool starts while copy threads hold locks, which forked children would inherit
+                    self._processes = concurrent.futures.ProcessPoolExecutor(
+                        max_workers=self.max_workers, mp_context=multiprocessing.get_context(PROCESS_START_METHOD)
+                    )
+                return self._processes
+            if self._threads is None:
+                self._threads = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="gargantua-op"
+                )
+            return self._threads
+
+    def map(self, op, calls):
+        """
+        Runs op.execute over every argument tuple and waits for the results.
+
+        Args:
+            op (FileOperation): The operation.
+            calls (iterable): Argument tuples, e.g. one per frame in frame order.
+
+        Returns:
+            list: The results, in call order.
+        """
+        calls = list(calls)
+        backend = self.backend_for(op)
+        pool = self._pool(backend)
+        if backend == "process":
+            futures = [
+                pool.submit(run_batch, op, calls[i:i + self.batch_size])
+                for i in range(0, len(calls), self.batch_size)
+            ]
+            return [result for future in futures for result in future.result()]
+        futures = [pool.submit(op.execute, *args) for args in calls]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait=True):
+        """Shuts down the pools that were started."""
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=wait)
@@ -0,0 +1,155 @@
+import re
+import json
+import logging
+
+from .ingestion_utils import SEQUENCE_REGEX
+from .ingestion_profiling import span
+from .ingestion_operations import ListFoldersOperation
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
+)
+
+# Folder and frame naming conventions of a vendor delivery. Patterns match at
+# the start of the name and must define the named groups used here: scene,
+# shot (and optionally shot_scene, checked against the parent SC folder),
+# resolution, and base/frame/ext for frames. Frames only go through a regex when
+# a layout overrides "frame"; the default uses the regex-free detector.
+DEFAULT_LAYOUT = {
+    "scene": r"SC_(?P<scene>\d+)",
+    "shot": r"(?P<shot_scene>\d+)_(?P<shot>[A-Za-z0-9_\-]+)",
+    "resolution": r"(?P<resolution>\d+x\d+)",
+    "frame": SEQUENCE_REGEX.pattern,
+}
+
+FOLDER_KINDS = ("scene", "shot", "resolution")
+
+
+class FolderLayout:
+    """
+    Classifies delivery folders with one precompiled matcher.
+
+    The scene, shot and resolution patterns are combined into a single
+    alternation, so every folder name is classified by one regex match, and
+    discovery carries the SC folder down explicitly instead of relying on the
+    order os.walk visits folders in.
+    """
+    def __init__(self, patterns=None, name="default"):
+        """
+        Args:
+            patterns (dict, optional): Overrides of DEFAULT_LAYOUT patterns.
+            name (str, optional): Name used in log messages.
+        """
+        self.name = name
+        self.patterns = dict(DEFAULT_LAYOUT, **(patterns or {}))
+        self.folder_regex = re.compile("|".join(
+            f"(?P<{kind}_dir>{self.patterns[kind]})" for kind in FOLDER_KINDS
+        ))
+        self.frame_regex = re.compile(patterns["frame"]) if patterns and patterns.get("frame") else None
+
+    def classify(self, folder_name):
+        """
+        Classifies a folder name.
+
+        Args:
+            folder_name (str): The folder name.
+
+        Returns:
+            tuple: (kind, groups) where kind is "scene", "shot", "resolution" or None.
+        """
+        match = self.folder_regex.match(folder_name)
+        if not match:
+            return None, {}
+        kind = match.lastgroup[:-len("_dir")]
+        return kind, {key: value for key, value in match.groupdict().items() if value is not None}
+
+    def iter_resolution_folders(self, base_path, list_folders=None, on_error=None):
+        """
+        Walks a delivery and yields every resolution folder with its parent context.
+
+        Shot folders count inside an SC folder only (and, if the shot pattern
+        captures shot_scene, only when it equals that SC folder's scene).
+        Resolution folders are the direct children of a shot folder.
+
+        A folder that cannot be listed is reported to on_error and the walk
+        goes on with the other folders.
+
+        Args:
+            base_path (str): The vendor/date folder.
+            list_folders (callable, optional): Returns the sorted (name, path) sub folders
+                of a folder, e.g. a RetryingFileOperation. Defaults to ListFoldersOperation.
+            on_error (callable, optional): Called with (error, path, scene, scene_path, shot)
+                for a folder that cannot be listed, scene and shot being None above
+                them. Defaults to logging the error.
+
+        Yields:
+            dict: scene_path, scene, shot, resolution and path of a resolution folder.
+        """
+        list_folders = list_folders or ListFoldersOperation().execute
+        on_error = on_error or self._log_error
+        stack = [(base_path, None, None)]
+        while stack:
+            path, scene, scene_path = stack.pop()
+            try:
+                with span("discovery"):
+                    folders = list_folders(path)
+            except Exception as e:
+                on_error(e, path, scene, scene_path, None)
+                continue
+            children = []
+            for folder_name, folder_path in folders:
+                kind, groups = self.classify(folder_name)
+                if kind == "scene":
+                    children.append((folder_path, groups["scene"], folder_path))
+                elif kind == "shot" and scene is not None and groups.get("shot_scene", scene) == scene:
+                    yield from self._iter_shot(folder_path, scene, scene_path, groups["shot"], list_folders, on_error)
+                else:
+                    children.append((folder_path, scene, scene_path))
+            stack.extend(reversed(children))
+
+    def _iter_shot(self, shot_path, scene, scene_path, shot, list_folders, on_error):
+        try:
+            with span("discovery"):
+                folders = list_folders(shot_path)
+        except Exception as e:
+            on_error(e, shot_path, scene, scene_path, shot)
+            return
+        for folder_name, folder_path in folders:
+            kind, groups = self.classify(folder_name)
+            if kind == "resolution":
+                yield {
+                    "scene_path": scene_path,
+                    "scene": scene,
+                    "shot": shot,
+                    "resolution": groups["resolution"],
+                    "path": folder_path,
+                }
+
+    @staticmethod
+    def _log_error(error, path, scene, scene_path, shot):
+        logging.error(f"Could not list {path}: {error}")
+
+
+def load_layouts(config_path=None):
+    """
+    Loads per-vendor folder layouts.
+
+    The optional JSON config maps vendor names (and "default") to pattern
+    overrides, e.g. {"vendorA": {"shot": "(?P<shot_scene>\\\\d+)-(?P<shot>\\\\w+)"}}.
+
+    Args:
+        config_path (str, optional): The JSON config.
+
+    Returns:
+        dict: vendor -> FolderLayout, with the fallback under "default".
+    """
+    config = {}
+    if config_path:
+        with open(config_path, 'r', encoding='utf-8') as config_file:
+            config = json.load(config_file)
+    default_patterns = config.pop("default", {})
+    layouts = {"default": FolderLayout(default_patterns)}
+    for vendor, patterns in config.items():
+        layouts[vendor] = FolderLayout(dict(default_patterns, **patterns), name=vendor)
+    return layouts
@@ -0,0 +1,130 @@
+import os
+import json
+import logging
+import threading
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
+)
+
+
+def file_signature(path):
+    """
+    Returns the cheap change signature of a file.
+
+    Args:
+        path (str): The file to stat.
+
+    Returns:
+        list: [size, mtime_ns] of the file.
+    """
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class FileManifest:
+    """
+    A JSON manifest recording the signature of every file already transferred,
+    keyed by a path relative to the transfer root. Used to work out which files
+    changed since the last transfer.
+    """
+    def __init__(self, path):
+        """
+        Initializes the manifest and loads it from disk if it exists.
+
+        Args:
+            path (str): The JSON file backing the manifest.
+        """
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Loads the manifest, starting empty if the file is missing or unreadable."""
+        if not os.path.isfile(self.path):
+            self.entries = {}
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as manifest_file:
+                self.entries = json.load(manifest_file).get('files', {})
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not read manifest {self.path}, starting empty: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Writes the manifest atomically next to its final location."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as manifest_file:
+                json.dump({'files': self.entries}, manifest_file, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+    def get(self, key):
+        """Returns the recorded entry for key, or None."""
+        with self._lock:
+            return self.entries.get(key)
+
+    def is_changed(self, key, signature):
+        """
+        Checks a file signature against the recorded one.
+
+        Args:
+            key (str): The relative path of the file.
+            signature (list): The current [size, mtime_ns] signature.
+
+        Returns:
+            bool: True if the file is new or its signature differs.
+        """
+        entry = self.get(key)
+        return entry is None or list(entry[:2]) != list(signature[:2])
+
+    def update(self, key, signature):
+        """Records the signature of a transferred file."""
+        with self._lock:
+            self.entries[key] = list(signature)
+
+
+class FolderRegistry:
+    """
+    A JSON list of folders, relative to a root, that a step wrote to. Ingest
+    records the plate folders it writes; egress leaves them out.
+    """
+    def __init__(self, path):
+        """
+        Args:
+            path (str): The JSON file backing the registry.
+        """
+        self.path = path
+        self.exists = os.path.isfile(path)
+        self.folders = self.read()
+        self._lock = threading.Lock()
+
+    def read(self):
+        """Returns the folders saved on disk, an empty set if the file is missing or unreadable."""
+        if not os.path.isfile(self.path):
+            return set()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as registry_file:
+                return set(json.load(registry_file).get('folders', []))
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not read {self.path}: {e}")
+            return set()
+
+    def add(self, folder):
+        with self._lock:
+            self.folders.add(folder)
+
+    def save(self):
+        """Writes the registry atomically, merged with the folders other jobs saved meanwhile."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        # Jobs of one service may save the same registry at once
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            self.folders |= self.read()
+            with open(tmp_path, 'w', encoding='utf-8') as registry_file:
+                json.dump({'folders': sorted(self.folders)}, registry_file, indent=1)
+            os.replace(tmp_path, self.path)
+            self.exists = True
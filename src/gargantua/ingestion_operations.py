@@ -1,25 +1,75 @@
 import os
-import shutil
+import hashlib
 import subprocess
+import threading
+import time
 import ffmpeg
 import logging
+
+from .ingestion_io import DEFAULT_BLOCK_SIZE, tuned_copy
+from .ingestion_dedup import full_hash
+from .ingestion_manifest import file_signature
+from .ingestion_utils import IngestionError
+from .ingestion_profiling import span
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
 )
 
 class FileOperation:
-    """Base class for file operations."""
+    """
+    Base class for file operations.
+
+    name selects the execution backend of the operation (see
+    ingestion_executors.ExecutorRouter), and cpu_bound operations default to
+    the process pool.
+    """
+    name = "operation"
+    cpu_bound = False
+
     def execute(self, *args, **kwargs):
         raise NotImplementedError
 
+class ListFoldersOperation(FileOperation):
+    """Lists the sub folders of a delivery folder for discovery, sorted by name."""
+    name = "discovery"
+
+    def execute(self, path):
+        """
+        Returns:
+            list: (name, path) of every sub folder.
+        """
+        with os.scandir(path) as entries:
+            return sorted((entry.name, entry.path) for entry in entries if entry.is_dir())
+
 class CopyFileOperation(FileOperation):
+    """
+    Copies a file in large sequential blocks with page cache hints and
+    destination preallocation (see ingestion_io.tuned_copy). With a controller,
+    copies wait for an in-flight slot and report their throughput to it.
+    """
+    name = "copy"
+
+    def __init__(self, block_size=DEFAULT_BLOCK_SIZE, fadvise=True, preallocate=True, controller=None):
+        self.block_size = block_size
+        self.fadvise = fadvise
+        self.preallocate = preallocate
+        self.controller = controller
+
     def execute(self, src, dst, overwrite=False):
         if os.path.exists(dst) and os.path.getsize(dst) > 0 and os.path.getsize(src) > 0 and not overwrite:
             logging.info(f"Skipped copy (already exists): {os.path.basename(dst)}")
             return
         os.makedirs(os.path.dirname(dst), exist_ok=True)
-        shutil.copy2(src, dst)
+        if self.controller:
+            with self.controller.slot():
+                start = time.monotonic()
+                with span("copy"):
+                    copied = tuned_copy(src, dst, self.block_size, self.fadvise, self.preallocate)
+            self.controller.record(copied, time.monotonic() - start)
+        else:
+            with span("copy"):
+                tuned_copy(src, dst, self.block_size, self.fadvise, self.preallocate)
 
         # Validate file sizes
         src_size = os.path.getsize(src)
@@ -31,12 +81,235 @@ class CopyFileOperation(FileOperation):
         
 
 
+class DedupCopyFileOperation(CopyFileOperation):
+    """
+    Copies files unless the content index already holds an identical file, in
+    which case the frame is hard linked to it ("link") or not written ("skip").
+    """
+    def __init__(self, index, mode="link", **kwargs):
+        super().__init__(**kwargs)
+        self.index = index
+        self.mode = mode
+        self.duplicates = {}  # source folder -> [(src, existing file)]
+        self._lock = threading.Lock()
+
+    def execute(self, src, dst, overwrite=False):
+        if os.path.exists(dst) and not overwrite:
+            return super().execute(src, dst, overwrite)
+        with span("dedup_lookup"):
+            existing, size, partial, full = self.index.find(src)
+        if existing and os.path.abspath(existing) != os.path.abspath(dst):
+            with self._lock:
+                self.duplicates.setdefault(os.path.dirname(src), []).append((src, existing))
+            if self.mode == "skip":
+                logging.info(f"Skipped copy (duplicate of {existing}): {os.path.basename(src)}")
+                return
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            if os.path.lexists(dst):
+                os.remove(dst)
+            try:
+                os.link(existing, dst)
+                logging.info(f"Linked file: {os.path.basename(src)} to {dst} (duplicate of {existing})")
+                return
+            except OSError as e:
+                logging.warning(f"Could not link {existing} -> {dst}, copying instead: {e}")
+        super().execute(src, dst, overwrite)
+        self.index.add(dst, size, partial, full)
+
+    def report(self):
+        """
+        Summarizes the re-delivered source folders.
+
+        Returns:
+            dict: source folder -> {'frames': duplicate count, 'matches': folders of the original files}.
+        """
+        with self._lock:
+            return {
+                folder: {
+                    'frames': len(pairs),
+                    'matches': sorted({os.path.dirname(existing) for _, existing in pairs}),
+                }
+                for folder, pairs in sorted(self.duplicates.items())
+            }
+
+
+class IncrementalCopyFileOperation(FileOperation):
+    """
+    Copies only the frames that changed since they were last ingested.
+
+    The manifest records, per destination frame, the size and mtime of the
+    source it was copied from, and its full content hash once computed. A frame
+    is copied again when the destination is missing or when the source size or
+    mtime differs from that record. With use_hash, a frame whose mtime changed
+    but not its size is compared by full content hash first, so a re-export of
+    identical content is not copied again.
+    Destinations are keyed by their path, which includes the version folder, so
+    a new version is always ingested in full. Copies go through copy_op.
+    """
+    name = "copy"
+
+    def __init__(self, copy_op, manifest, root, use_hash=False):
+        """
+        Args:
+            copy_op (CopyFileOperation): The operation doing the copies.
+            manifest (FileManifest): The record of ingested frames.
+            root (str): Destination root the manifest keys are relative to.
+            use_hash (bool, optional): Compare the content hash of frames whose mtime changed. Defaults to False.
+        """
+        self.copy_op = copy_op
+        self.manifest = manifest
+        self.root = root
+        self.use_hash = use_hash
+        self.changes = {}  # destination folder -> {'new': [...], 'changed': [...], 'unchanged': count}
+        self._lock = threading.Lock()
+
+    def is_current(self, key, src, src_signature, dst):
+        """
+        Returns True if dst already holds the frame src.
+
+        Args:
+            key (str): The manifest key of dst.
+            src (str): The source frame.
+            src_signature (list): [size, mtime_ns] of src. The content hash of
+                src is appended when known, to be recorded in the manifest.
+            dst (str): The destination frame.
+        """
+        if not os.path.exists(dst):
+            return False
+        entry = self.manifest.get(key)
+        if entry is None:
+            # Ingested before the manifest existed: copies keep the source mtime
+            entry = file_signature(dst)
+        elif os.path.getsize(dst) != entry[0]:
+            return False
+        if entry[0] != src_signature[0]:
+            return False
+        if entry[1] == src_signature[1]:
+            src_signature[2:] = entry[2:]
+            return True
+        if not self.use_hash:
+            return False
+        with span("content_hash"):
+            recorded = entry[2] if len(entry) > 2 else full_hash(dst)
+            src_signature[2:] = [full_hash(src)]
+        return recorded == src_signature[2]
+
+    def execute(self, src, dst, overwrite=False):
+        key = os.path.relpath(dst, self.root)
+        with span("change_detection"):
+            src_signature = file_signature(src)
+            current = not overwrite and self.is_current(key, src, src_signature, dst)
+        if current:
+            self.record(dst, 'unchanged')
+            if self.manifest.get(key) != src_signature:
+                self.manifest.update(key, src_signature)
+            return
+        status = 'changed' if os.path.exists(dst) else 'new'
+        self.copy_op.execute(src, dst, True)
+        self.manifest.update(key, src_signature)
+        self.record(dst, status)
+
+    def record(self, dst, status):
+        with self._lock:
+            entry = self.changes.setdefault(os.path.dirname(dst), {'new': [], 'changed': [], 'unchanged': 0})
+            if status == 'unchanged':
+                entry['unchanged'] += 1
+            else:
+                entry[status].append(os.path.basename(dst))
+
+    def report(self):
+        """
+        Summarizes the frames copied per destination folder.
+
+        Returns:
+            dict: destination folder -> {'new': frames, 'changed': frames, 'unchanged': count},
+                  for folders where anything was copied.
+        """
+        with self._lock:
+            return {
+                folder: {'new': sorted(entry['new']), 'changed': sorted(entry['changed']), 'unchanged': entry['unchanged']}
+                for folder, entry in sorted(self.changes.items())
+                if entry['new'] or entry['changed']
+            }
+
+
+class FrameValidationOperation(FileOperation):
+    """
+    Checks that a copied frame is readable: EXR frames must start with the
+    OpenEXR magic number and carry a complete header, and every frame is
+    checksummed. Pure Python and CPU bound, so it runs in the process pool by
+    default; instances must stay picklable.
+    """
+    name = "validate"
+    cpu_bound = True
+
+    EXR_MAGIC = b"\x76\x2f\x31\x01"
+
+    def __init__(self, checksum=True, block_size=DEFAULT_BLOCK_SIZE):
+        self.checksum = checksum
+        self.block_size = block_size
+
+    def execute(self, path):
+        """
+        Args:
+            path (str): The frame.
+
+        Returns:
+            dict: path, valid, error (None when valid) and checksum (blake2b hex or None).
+        """
+        result = {'path': path, 'valid': True, 'error': None, 'checksum': None}
+        try:
+            with open(path, 'rb') as frame:
+                if path.lower().endswith('.exr'):
+                    result['error'] = self.check_exr_header(frame)
+                    result['valid'] = result['error'] is None
+                    frame.seek(0)
+                if self.checksum:
+                    digest = hashlib.blake2b(digest_size=16)
+                    for block in iter(lambda: frame.read(self.block_size), b''):
+                        digest.update(block)
+                    result['checksum'] = digest.hexdigest()
+        except OSError as e:
+            result['valid'] = False
+            result['error'] = str(e)
+        return result
+
+    def check_exr_header(self, frame):
+        """
+        Walks the EXR header attributes up to the terminating null byte.
+
+        Returns:
+            str or None: The problem found, or None if the header is complete.
+        """
+        if frame.read(4) != self.EXR_MAGIC:
+            return "not an OpenEXR file"
+        if len(frame.read(4)) != 4:
+            return "truncated version field"
+        header = frame.read(64 * 1024)
+        offset = 0
+        while True:
+            if offset >= len(header):
+                return "truncated header"
+            if header[offset] == 0:
+                return None
+            # attribute name and type are null terminated, followed by a 4 byte size
+            for _ in range(2):
+                end = header.find(b'\x00', offset)
+                if end < 0:
+                    return "truncated header"
+                offset = end + 1
+            if offset + 4 > len(header):
+                return "truncated header"
+            offset += 4 + int.from_bytes(header[offset:offset + 4], 'little')
+
+
 class ProxyGenerationOperation(FileOperation):
+    name = "proxy"
+
     def execute(self, input_path, output_path, fmt):
         fmt = fmt.lower()
         if fmt not in ["jpeg", "png"]:
-            logging.info(f"Unsupported format: {fmt}")
-            return
+            raise IngestionError(f"Unsupported proxy format: {fmt}")
         command = [
             "openimageio", "convert", input_path,
             "-o", output_path, "-format", fmt
@@ -45,10 +318,13 @@ class ProxyGenerationOperation(FileOperation):
         try:
             subprocess.run(command, check=True, capture_output=True)
             logging.info(f"Proxy generated: {output_path}")
-        except Exception as e:
-            logging.info(f"Proxy generation failed: {e}")
+        except (OSError, subprocess.CalledProcessError) as e:
+            logging.error(f"Proxy generation failed for {input_path}: {e}")
+            raise IngestionError(f"Proxy generation failed for {input_path}: {e}") from e
 
 class MovGenerationOperation(FileOperation):
+    name = "mov"
+
     def execute(self, input_pattern, output_mov, fps=24):
         logging.info(f"Generating MOV: {output_mov} from {input_pattern}")
         (
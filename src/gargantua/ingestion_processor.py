@@ -1,13 +1,17 @@
 import os
-import sys
 import re
 import logging
 import datetime
-import shutil
+import json
+import hashlib
 import pandas as pd
 from enum import Enum, unique
 import subprocess
 import concurrent.futures
+import functools
+import itertools
+import threading
+import time
 import logging
 logging.basicConfig(
     level=logging.INFO,
@@ -15,11 +19,22 @@ logging.basicConfig(
 )
 
 
-from .ingestion_operations import ProxyGenerationOperation, CopyFileOperation, MovGenerationOperation
+from .ingestion_operations import ProxyGenerationOperation, CopyFileOperation, MovGenerationOperation, DedupCopyFileOperation, FrameValidationOperation, IncrementalCopyFileOperation, ListFoldersOperation
+from .ingestion_manifest import FileManifest, FolderRegistry
+from .ingestion_retry import RetryingFileOperation, CircuitBreakers
+from .ingestion_results import OperationResult, RunResults, load_failures
+from .ingestion_profiling import span
+from .ingestion_executors import ExecutorRouter, DEFAULT_BATCH_SIZE
+from .ingestion_dedup import ContentIndex
+from .ingestion_io import DEFAULT_BLOCK_SIZE, free_space
+from .ingestion_concurrency import AdaptiveConcurrencyController
+from .ingestion_layout import load_layouts
+from .ingestion_scheduler import PriorityScheduler, INTERACTIVE_PRIORITY, DEFAULT_PRIORITY
 from .csv_file_reader import MVLCSVReader
 from .ingestion_utils import check_missing_frames
 from .ingestion_builder import SequenceBuilder
-from .ingestion_utils import get_files_and_sequences
+from .ingestion_egress import EgressPackager, summarize_delta, PLATE_REGISTRY_NAME
+from .ingestion_utils import get_files_and_sequences, generate_sequence_output_paths, parse_input_dates, split_list, IngestionError
 
 @unique
 class INGESTIONPROCESS(Enum):
@@ -28,49 +43,304 @@ class INGESTIONPROCESS(Enum):
 	
 class MVLIngestionProcessor():
 
-	def __init__(self, args):
-		self.data = vars(args)
+	def __init__(self, args, scheduler=None, frame_pool=None, controller=None, progress=None, router=None, breakers=None):
+		"""
+		Initializes the processor. No filesystem work happens until prepare() or execute().
+
+		Args:
+			args (argparse.Namespace, dict or IngestJobConfig): The job options.
+			scheduler (PriorityScheduler, optional): Shared task scheduler. Defaults to one per run.
+			frame_pool (concurrent.futures.Executor, optional): Shared frame copy pool. Defaults to one per run.
+			controller (AdaptiveConcurrencyController, optional): Shared concurrency controller.
+			progress (callable, optional): Called with a dict for every progress event.
+			router (ExecutorRouter, optional): Shared backend of per-frame proxy and validation work.
+			breakers (CircuitBreakers, optional): Shared per-mount circuit breakers.
+		"""
+		if hasattr(args, 'to_dict'):
+			self.data = args.to_dict()
+		elif isinstance(args, dict):
+			self.data = dict(args)
+		else:
+			self.data = vars(args)
+		self.sources = []  # one entry per project/vendor/date folder to ingest
+		self.csv_cache = {}  # CSV content hash -> shot mapping, shared by every date, project and pass over the sources
+		self.results = {}  # (project, date) -> counters reported at the end of the run
+		self.run_results = RunResults()  # per task outcomes, rolled up per shot and vendor
+		self.rerun_shots = None  # (project, vendor, date, scene, shot) limiting a --rerun_failures run
+		self.shot_owners = {}  # (project, date, shot name, type) -> vendor whose delivery writes that shot folder
+		self.skipped_shots = set()  # (project, vendor, date, scene, shot) left to another vendor's delivery
+		self.plate_folders = None  # FolderRegistry of the plate folders ingest wrote to, kept out of egress
+		self.discovery = None  # RetryingFileOperation running the listings and reads of discovery
+		self.discovery_failures = set()  # (project, vendor, date, scene, shot) whose discovery failed
+		self.breakers = breakers or CircuitBreakers()
+		self._results_lock = threading.Condition()
+		self._pending_tasks = 0
+		self.priority_shots = set(split_list(self.data.get('priority_shots')))
+		self.layouts = None
+		self.prepared = False
+		self.scheduler = scheduler
+		self.frame_pool = frame_pool
+		self.progress = progress
+		self.router = router
+
+		self.max_workers = self.data.get('max_workers') or os.cpu_count() or 4
+		self.controller = controller
+		self._owns_controller = False
+		if controller is None and not self.data.get('fixed_workers'):
+			self.controller = AdaptiveConcurrencyController(
+				min_workers=self.data.get('min_workers') or 1,
+				max_workers=self.max_workers,
+			)
+			self._owns_controller = True
+		self.copy_op = CopyFileOperation(**self.copy_options())
+		self.dedup_op = None
+		self.incremental_op = None
+		self.proxy_op = ProxyGenerationOperation()
+		self.mov_op = MovGenerationOperation()
+		self.validate_op = FrameValidationOperation(block_size=self.copy_options()['block_size'])
+
+	def prepare(self):
+		"""
+		Resolves the sources of the job on disk. Called by execute() if needed.
+
+		Raises:
+			IngestionError: If the options do not resolve to anything to process.
+		"""
+		if self.prepared:
+			return
+		if self.data.get('rerun_failures'):
+			self.load_rerun()
+		self.layouts = load_layouts(self.data.get('layout_config'))
 		if self.data.get('process'):
 			self.process_to_mvl()
 		elif not self.data.get('process'):
 			self.process_from_mvl()
-		
-		self.copy_op = CopyFileOperation()
-		self.proxy_op = ProxyGenerationOperation()
-		self.mov_op = MovGenerationOperation()
-    
+		if self.rerun_shots is not None:
+			sources = {shot_key[:3] for shot_key in self.rerun_shots}
+			self.sources = [source for source in self.sources if (source["project"], source["vendor"], source["date"]) in sources]
+		if self.data.get('process'):
+			self.plate_folders = FolderRegistry(os.path.join(self.data.get("destination"), ".gargantua", PLATE_REGISTRY_NAME))
+		if self.data.get('dedup') and self.data.get('process'):
+			post_steps = [option for option in ('validate', 'proxy_format', 'mov') if self.data.get(option)]
+			if self.data.get('dedup') == "skip" and post_steps:
+				# Skipped frames leave holes in the plate folder that these steps would read
+				raise IngestionError(
+					f"--dedup skip does not write duplicate frames, it cannot be combined with "
+					f"{', '.join('--' + option for option in post_steps)}. Use --dedup link instead."
+				)
+			self.copy_op = self.dedup_op = self.create_dedup_copy_op()
+		if (self.data.get('incremental') or self.data.get('incremental_hash')) and self.data.get('process'):
+			self.copy_op = self.incremental_op = IncrementalCopyFileOperation(
+				self.copy_op,
+				FileManifest(os.path.join(self.data.get("destination"), ".gargantua", "ingest_manifest.json")),
+				self.data.get("destination"),
+				use_hash=bool(self.data.get('incremental_hash')),
+			)
+		retries = self.data.get('retries')
+		self.copy_op = RetryingFileOperation(
+			self.copy_op,
+			retries=3 if retries is None else retries,
+			base_delay=self.data.get('retry_delay') or 0.5,
+			breakers=self.breakers,
+		)
+		self.discovery = RetryingFileOperation(
+			ListFoldersOperation(),
+			retries=self.copy_op.retries,
+			base_delay=self.copy_op.base_delay,
+			breakers=self.breakers,
+		)
+		self.prepared = True
+
+	def load_rerun(self):
+		"""
+		Restricts the job to the shots of a failure list. The job options saved in
+		the list replace the given ones, except for the copy tuning options that
+		were already applied.
+
+		Raises:
+			IngestionError: If the failure list cannot be read.
+		"""
+		path = self.data.get('rerun_failures')
+		try:
+			options, self.rerun_shots = load_failures(path)
+		except (OSError, ValueError, KeyError) as e:
+			raise IngestionError(f"Could not read failure list {path}: {e}") from e
+		self.data = dict(options, rerun_failures=path)
+		logging.info(f"Re-running {len(self.rerun_shots)} failed shots from {path}")
+
+	def emit(self, event, **fields):
+		"""
+		Sends a progress event to the progress callback, if any.
+
+		Args:
+			event (str): The event type, e.g. "task_done".
+			**fields: Event details.
+		"""
+		if self.progress:
+			try:
+				self.progress(dict(fields, event=event))
+			except Exception as e:
+				logging.warning(f"Progress callback failed: {e}")
+
+	def create_dedup_copy_op(self):
+		"""
+		Creates the deduplicating copy operation, seeding the content index from the
+		plates of earlier ingests the first time it is used on a destination.
+		"""
+		index = ContentIndex(os.path.join(self.data.get("destination"), ".gargantua", "content_index.json"))
+		if not index.loaded:
+			for project in split_list(self.data.get("project")):
+				sequences_root = os.path.join(self.data.get("destination"), project, "work", "sequences")
+				if os.path.isdir(sequences_root):
+					logging.info(f"Building content index from {sequences_root} ...")
+					logging.info(f"Indexed {index.build(sequences_root)} files")
+		return DedupCopyFileOperation(index, self.data.get('dedup'), **self.copy_options())
+
+	def copy_options(self):
+		"""Returns the I/O tuning options of the copy operations."""
+		block_size_mb = self.data.get('block_size') or DEFAULT_BLOCK_SIZE // (1024 * 1024)
+		return {
+			'block_size': int(block_size_mb * 1024 * 1024),
+			'fadvise': not self.data.get('no_fadvise'),
+			'preallocate': not self.data.get('no_preallocate'),
+			'controller': self.controller,
+		}
+
+	def plan_total_bytes(self):
+		"""
+		Sums the size of the files the run will write: those of the shots to
+		ingest whose destination does not already hold a file of the same size.
+
+		Returns:
+			int: The planned number of bytes to ingest, an upper bound since
+				 duplicate frames are not copied again.
+		"""
+		total = 0
+		for kind, priority, cost, job_key, metadata, item, folder in self.iter_tasks(record_failures=False):
+			try:
+				if kind == "files":
+					pairs = [(item, self.file_plate_path(item, metadata, folder))]
+				else:
+					start_frame = metadata.get('start_frame', 1001)
+					pairs = [
+						(src, generate_sequence_output_paths(item, metadata, frame_number=frame, ext='exr')['plate'])
+						for frame, src in enumerate(item['paths'], start_frame)
+					]
+			except (IngestionError, TypeError):
+				# Shots without output paths fail without writing anything
+				continue
+			for src, dst in pairs:
+				try:
+					size = os.path.getsize(src)
+				except OSError as e:
+					logging.warning(f"Could not size {e.filename}: {e}")
+					continue
+				try:
+					if os.path.getsize(dst) == size:
+						continue
+				except OSError:
+					pass
+				total += size
+		return total
+
+	def check_destination_space(self):
+		"""Raises IngestionError before copying anything if the planned bytes do not fit on the destination."""
+		planned = self.plan_total_bytes()
+		available = free_space(self.data.get("destination"))
+		logging.info(f"Planned ingest: {planned / 1024 ** 3:.2f} GiB, free on destination: {available / 1024 ** 3:.2f} GiB")
+		if planned > available:
+			raise IngestionError(
+				f"Not enough space on {self.data.get('destination')}: {planned} bytes planned, {available} free. "
+				"Use --no_space_check to ingest anyway."
+			)
+
+	def report_duplicates(self):
+		"""Saves the content index and writes the list of re-delivered shots."""
+		self.dedup_op.index.save()
+		report = self.dedup_op.report()
+		if not report:
+			logging.info("No re-delivered frames found.")
+			return
+		for folder, entry in report.items():
+			logging.info(f"Re-delivery: {folder} ({entry['frames']} frames) matches {', '.join(entry['matches'])}")
+		report_path = os.path.join(
+			self.data.get("destination"), ".gargantua",
+			f"dedup_report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+		)
+		with open(report_path, 'w', encoding='utf-8') as report_file:
+			json.dump(report, report_file, indent=1)
+		logging.info(f"Dedup report written: {report_path}")
+
+	def report_changes(self):
+		"""Saves the ingest manifest and writes the frames copied per shot by an incremental run."""
+		self.incremental_op.manifest.save()
+		report = self.incremental_op.report()
+		if not report:
+			logging.info("Incremental ingest: no new or changed frames.")
+			return
+		destination = self.data.get("destination")
+		for folder, entry in report.items():
+			changed = f": {', '.join(entry['changed'])}" if entry['changed'] else ""
+			logging.info(
+				f"Incremental ingest {os.path.relpath(folder, destination)}: {len(entry['new'])} new, "
+				f"{len(entry['changed'])} changed, {entry['unchanged']} unchanged frames{changed}"
+			)
+		self.emit("changes", report=report)
+		report_path = os.path.join(
+			destination, ".gargantua",
+			f"incremental_report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+		)
+		with open(report_path, 'w', encoding='utf-8') as report_file:
+			json.dump(report, report_file, indent=1)
+
 	def process_to_mvl(self):
 		logging.info(f"process to mvl started ...")
 		source_dir = self.data.get("source")
 		if not source_dir and not os.path.isdir(source_dir):
-			source_dir = "C:" 
-		
-		project_path = os.path.join(source_dir, self.data.get("project"))
-		logging.info(f"project path : {project_path}")
-		if not os.path.isdir(project_path):
-			logging.error(f"Project path not found: {project_path}")
-			exit(1)
-		else:
+			source_dir = "C:"
+
+		input_date = self.data.get("input_date")
+		if not input_date:
+			raise IngestionError("Error: No input date provided. Use --input_date YYYYMMDD.")
+		try:
+			dates = parse_input_dates(input_date)
+		except ValueError as e:
+			raise IngestionError(f"Error: Invalid date {input_date} format for vault path ({e}). Use YYYYMMDD, a comma separated list or a YYYYMMDD-YYYYMMDD range.") from e
+
+		projects = split_list(self.data.get("project"))
+		if not projects:
+			raise IngestionError("Error: No project provided.")
+
+		for project in projects:
+			project_path = os.path.join(source_dir, project)
+			logging.info(f"project path : {project_path}")
+			if not os.path.isdir(project_path):
+				raise IngestionError(f"Project path not found: {project_path}")
 			logging.info(f"Using project path: {project_path}")
-			source_dir = project_path
 
-		#add vault and IO process path
-		vault_path = os.path.join(source_dir, "vault")
-		input_date = str(self.data.get("input_date"))
-		if input_date and len(input_date) == 8:
+			#add vault and IO process path
+			vault_path = os.path.join(project_path, "vault")
 			try:
-				date_obj = datetime.datetime.strptime(input_date,  "%Y%m%d")
-				date_str = date_obj.strftime("%Y%m%d")
-				self.proces_vendor(date_str, vault_path, INGESTIONPROCESS.INGEST)
-			except ValueError:
-				logging.error(f"Error: Invalid date  {input_date} format for vault path. Use YYYYMMDD.")
-				sys.exit(1)
-			except Exception as e:
-				logging.error(f"Error: An unexpected error occured {e}")
-				sys.exit(1)
-		
-	def proces_vendor(self, date_str, vault_path, process):
-		
+				self.proces_vendor(dates, vault_path, INGESTIONPROCESS.INGEST, project)
+			except OSError as e:
+				raise IngestionError(f"Error: An unexpected error occured {e}") from e
+
+		if not self.sources:
+			raise IngestionError(f"No vault path found for dates {', '.join(dates)} in projects {', '.join(projects)}.")
+
+	def proces_vendor(self, dates, vault_path, process, project=None):
+		"""
+		Registers every vendor/date folder under the vault for the requested dates.
+
+		The vault is listed once per project and each vendor folder once, whatever
+		the number of requested dates.
+
+		Args:
+			dates (list): Dates as YYYYMMDD strings.
+			vault_path (str): The project vault folder.
+			process (INGESTIONPROCESS): Selects the to_mvl or from_mvl side of the vault.
+			project (str, optional): The project the vault belongs to.
+		"""
 		if process == INGESTIONPROCESS.INGEST:
 			vault_path = os.path.join(vault_path, "to_mvl")
 		elif process == INGESTIONPROCESS.EGRESS:
@@ -78,39 +348,42 @@ class MVLIngestionProcessor():
 
 		logging.info(f"vault path {vault_path}")
 
-		vendor = self.data.get("vendor") 
+		vendor = self.data.get("vendor")
 		if vendor:
-			vendor_date_path = os.path.join(vault_path, vendor, date_str)
-			if os.path.isdir(vendor_date_path):
-				logging.info(f"Using path: {vault_path}")
-				self.data["source"] = vendor_date_path
-			else:
-				logging.error(f"Vendor path not found: {vault_path}")
-				exit(1)
-		else:
+			vendor_dirs = [vendor]
+		elif os.path.isdir(vault_path):
 			# No vendor provided, check all directories under vault
-			vault_vendors = vault_path
-			if os.path.isdir(vault_vendors):
-				self.data["source"] = [] # make source_dir a list.
-				found_date_path = False
-				for vendor_dir in os.listdir(vault_vendors):
-					vendor_date_path = os.path.join(vault_vendors, vendor_dir, date_str)
-					if os.path.isdir(vendor_date_path):
-						logging.info(f"Using vault path: {vendor_date_path}")
-						self.data["source"].append(vendor_date_path) #add to list.
-						found_date_path = True
-				if not found_date_path:
-					logging.error(f"Vault path with date {date_str} not found under any vendor.")
-					exit(1)
-			else:
-				logging.error(f"Vault vendors directory not found: {vault_vendors}")
-				exit(1)
+			vendor_dirs = sorted(os.listdir(vault_path))
+		else:
+			raise IngestionError(f"Vault vendors directory not found: {vault_path}")
+
+		wanted_dates = set(dates)
+		found_dates = set()
+		for vendor_dir in vendor_dirs:
+			vendor_path = os.path.join(vault_path, vendor_dir)
+			if not os.path.isdir(vendor_path):
+				if vendor:
+					raise IngestionError(f"Vendor path not found: {vendor_path}")
+				continue
+			for date_str in sorted(wanted_dates.intersection(os.listdir(vendor_path))):
+				vendor_date_path = os.path.join(vendor_path, date_str)
+				if os.path.isdir(vendor_date_path):
+					logging.info(f"Using vault path: {vendor_date_path}")
+					self.sources.append({
+						"project": project or self.data.get("project"),
+						"vendor": vendor_dir,
+						"date": date_str,
+						"path": vendor_date_path,
+					})
+					found_dates.add(date_str)
+
+		for date_str in sorted(wanted_dates - found_dates):
+			logging.warning(f"Vault path with date {date_str} not found under any vendor in {vault_path}.")
 
 	def validate_destination(self):
 		destination_dir = self.data.get("destination")
 		if not destination_dir:
-			logging.error("Destination directory not provided.")
-			exit(1)
+			raise IngestionError("Destination directory not provided.")
 
 		if not os.path.isdir(destination_dir):
 			dest = self.data.get("destination")
@@ -119,100 +392,487 @@ class MVLIngestionProcessor():
 
 		if not self.data.get("project"):
 			logging.info(f"Error: {self.data.get('project')} is not a valid project.")
-			return 
-    
+			return
+
 	def process_from_mvl(self):
-		return NotImplementedError("Not implement yet!")
-	
+		"""
+		Registers the egress jobs: one per project, sending the pipeline shot folders
+		that changed since the last egress into vault/from_mvl/<vendor>/<date>.
+		"""
+		logging.info(f"process from mvl started ...")
+		source_dir = self.data.get("source")
+		vendor = self.data.get("vendor")
+		if not vendor:
+			raise IngestionError("Error: Egress needs a --vendor to send to.")
+
+		input_date = self.data.get("input_date")
+		try:
+			dates = parse_input_dates(input_date) if input_date else [datetime.date.today().strftime("%Y%m%d")]
+		except ValueError as e:
+			raise IngestionError(f"Error: Invalid date {input_date} format for vault path ({e}). Use YYYYMMDD.") from e
+		if len(dates) != 1:
+			raise IngestionError(f"Error: Egress writes a single delivery date, got {len(dates)}.")
+		if not split_list(self.data.get("egress_shots")):
+			# Without a scope the first egress would send every vendor's work
+			raise IngestionError("Error: Egress needs --egress_shots, the shot folders to send (e.g. SC_48/SH_0160).")
+
+		for project in split_list(self.data.get("project")):
+			project_path = os.path.join(source_dir, project)
+			if not os.path.isdir(project_path):
+				raise IngestionError(f"Project path not found: {project_path}")
+			self.sources.append({
+				"project": project,
+				"vendor": vendor,
+				"date": dates[0],
+				"path": os.path.join(self.data.get("destination"), project, "work", "sequences"),
+				"vault": os.path.join(project_path, "vault", "from_mvl", vendor),
+			})
+
+	def execute_egress(self):
+		"""
+		Sends the delta of every registered egress job and reports it per project.
+
+		Returns:
+			dict: (project, date) -> number of files sent.
+		"""
+		plate_folders = FolderRegistry(os.path.join(self.data.get("destination"), ".gargantua", PLATE_REGISTRY_NAME))
+		if not plate_folders.exists and not self.data.get("egress_plates"):
+			raise IngestionError(
+				f"Error: No record of ingested plates at {plate_folders.path}, egress cannot leave them out. "
+				"Ingest into this destination first, or pass --egress_plates to send them."
+			)
+		for source in self.sources:
+			prefix = f"{source['project']}/work/sequences/"
+			packager = EgressPackager(
+				source["path"],
+				source["vault"],
+				source["date"],
+				self.copy_op,
+				self.data.get("egress_format") or "copy",
+			)
+			delta, unchanged = packager.collect_delta(
+				split_list(self.data.get("egress_shots")),
+				excluded_folders=() if self.data.get("egress_plates") else {
+					folder[len(prefix):] for folder in plate_folders.folders if folder.startswith(prefix)
+				},
+			)
+			for version, count in sorted(summarize_delta(delta).items()):
+				logging.info(f"Egress {source['vendor']}: {version} ({count} changed files)")
+			self.results[(source["project"], source["date"])] = {"files": len(delta), "sequences": 0, "failed": 0}
+			if not delta:
+				logging.info(f"Egress {source['project']} {source['vendor']} {source['date']}: nothing changed, {unchanged} files already sent")
+				continue
+			target = packager.write(delta, f"{source['project']}_{source['vendor']}_{source['date']}")
+			total_bytes = sum(signature[0] for _, _, signature in delta)
+			logging.info(
+				f"Egress {source['project']} {source['vendor']} {source['date']}: "
+				f"{len(delta)} changed files ({total_bytes} bytes) sent to {target}, {unchanged} unchanged skipped"
+			)
+			self.emit("egress_done", project=source["project"], vendor=source["vendor"], date=source["date"], target=target, files=len(delta))
+		return self.results
+
 	def execute(self):
 		"""
 		Processes folders, gets all files and file sequences from resolution folders.
 
+		Every registered project/vendor/date source is scanned and copied by a
+		single pool, and the results are reported per date. Discovery feeds the
+		pool through a bounded queue, so copying starts while scanning is still in
+		progress and memory does not grow with the size of the delivery.
+
+		Output paths do not include the delivery date, so the dates of a batch
+		run one after another, oldest first, and a shot delivered on several
+		dates is written by the first of them like in separate runs.
+
+		Returns:
+			dict: (project, date) -> counts of files, sequences and failed tasks.
+
+		Raises:
+			IngestionError: If the job cannot run.
+		"""
+		self.prepare()
+		if not self.sources:
+			raise IngestionError("Error: No source paths to process.")
+		if not self.data.get('process'):
+			return self.execute_egress()
+
+		# The check lists every frame before the first copy; incremental and re-run
+		# jobs only write a few frames and start copying straight away.
+		if not (self.data.get('no_space_check') or self.data.get('incremental') or self.data.get('incremental_hash') or self.rerun_shots is not None):
+			with span("space_check"):
+				self.check_destination_space()
+		self.emit("started", sources=[dict(source) for source in self.sources])
+
+		num_workers = self.max_workers
+		# Frame copies of every sequence share one pool; the controller decides how
+		# many of its threads copy at once.
+		frame_pool = self.frame_pool or concurrent.futures.ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="gargantua-copy")
+		# Priorities and shortest job first only apply within the queued window,
+		# so shots listed with --priority_shots are found by a first pass over the
+		# folders (files are only listed in the priority shots) and queued before
+		# discovery of the bulk work starts.
+		scheduler = self.scheduler or PriorityScheduler(max_workers=num_workers, max_pending=num_workers * 4)
+		# CPU-bound per-frame work goes through the router, copies stay on frame_pool
+		router = self.router or ExecutorRouter(
+			backends=self.data.get('backend'),
+			max_workers=num_workers,
+			batch_size=self.data.get('batch_size') or DEFAULT_BATCH_SIZE,
+		)
+		try:
+			for date_str in sorted({source["date"] for source in self.sources}):
+				if self.priority_shots:
+					tasks = itertools.chain(self.iter_tasks(interactive=True, date=date_str), self.iter_tasks(interactive=False, date=date_str))
+				else:
+					tasks = self.iter_tasks(date=date_str)
+				self.submit_tasks(tasks, scheduler, frame_pool, router)
+				# Wait for this date's tasks only, the scheduler may be shared
+				with self._results_lock:
+					while self._pending_tasks:
+						self._results_lock.wait()
+		finally:
+			if scheduler is not self.scheduler:
+				scheduler.shutdown()
+			if frame_pool is not self.frame_pool:
+				frame_pool.shutdown()
+			if router is not self.router:
+				router.shutdown()
+			self.plate_folders.save()
+
+		if self.controller and self._owns_controller:
+			self.controller.summary()
+		self.display_date_results()
+		if self.copy_op.retried:
+			logging.warning(f"{self.copy_op.retried} copies were retried after transient I/O errors")
+		with span("reports"):
+			self.run_results.log_summary()
+			failures_path = self.run_results.write(os.path.join(self.data.get("destination"), ".gargantua"), self.data)
+			if self.dedup_op:
+				self.report_duplicates()
+			if self.incremental_op:
+				self.report_changes()
+		self.emit("finished", results=self.results, failures=failures_path)
+		return self.results
+
+	def submit_tasks(self, tasks, scheduler, frame_pool, router):
+		"""
+		Submits the tasks yielded by iter_tasks to the scheduler as they are found.
+
+		Args:
+			tasks (iterable): The iter_tasks tuples.
+			scheduler (PriorityScheduler): Runs the shot tasks.
+			frame_pool (concurrent.futures.Executor): Copies the frames of sequences.
+			router (ExecutorRouter): Runs the per-frame proxy and validation work.
+		"""
+		num_workers = self.max_workers
+		for kind, priority, cost, job_key, metadata, item, folder in tasks:
+			builder = None
+			if kind == "files":
+				task = (self.copy_file, item, metadata, folder)
+			else:
+				builder = SequenceBuilder(
+					sequence=item,
+					copy_op=self.copy_op,
+					proxy_op=self.proxy_op,
+					mov_op=self.mov_op,
+					executor=frame_pool,
+					num_workers=num_workers,
+					router=router,
+					validate_op=self.validate_op,
+				)
+				task = (builder.build, False, metadata)
+			plate_folder = self.plate_folder(kind, item, metadata, folder)
+			if plate_folder:
+				self.plate_folders.add(os.path.relpath(plate_folder, self.data.get("destination")).replace(os.sep, '/'))
+			result = OperationResult(
+				project=job_key[0], date=job_key[1], vendor=folder["vendor"],
+				scene=folder["scene"], shot=folder["shot"], kind=kind,
+				item=item if kind == "files" else f"{item['base_name']}{item.get('separator', '_')}{item['start']}-{item['end']}.{item['extension']}",
+			)
+			with self._results_lock:
+				self._pending_tasks += 1
+			future = scheduler.submit(self.run_task, result, builder, *task, priority=priority, cost=cost)
+			future.add_done_callback(functools.partial(self.record_result, job_key, result))
+
+	def run_task(self, result, builder, fn, *args):
+		"""
+		Runs an ingest task, timing it and noting the frames copied and the
+		operation it failed in on its OperationResult.
+		"""
+		start = time.monotonic()
+		try:
+			fn(*args)
+		finally:
+			result.seconds = round(time.monotonic() - start, 3)
+			if builder:
+				result.frames = len(builder.copied_paths)
+				result.stage = builder.stage
+			else:
+				result.stage = "copy"
+
+	def iter_tasks(self, interactive=None, date=None, record_failures=True):
+		"""
+		Walks every registered source and yields copy tasks as they are found.
+
+		A shot folder delivered by several vendors on the same date is written by
+		the first vendor only; the others are skipped with a warning.
+
+		Listings and reads go through the retries and circuit breakers of the
+		copies. A folder that still cannot be read fails its scene or shot, and
+		the other shots of the source are still discovered.
+
 		Args:
-		base_path (str): The base path containing the folders to process.
-		"""
-		paths = [self.data.get("source")]
-		if not isinstance(paths, list):
-			return 
-		
-		file_tasks = []
-		sequence_tasks = []
-		
-		for base_path in paths:
+			interactive (bool, optional): Only yield the shots listed with --priority_shots
+				(True) or only the others (False). Defaults to all shots.
+			date (str, optional): Only walk the sources of this delivery date. Defaults to all dates.
+			record_failures (bool, optional): Record a failed OperationResult for every scene
+				or shot that could not be discovered. Defaults to True.
+
+		Yields:
+			tuple: (kind, priority, cost, job_key, metadata, item, folder) where kind is "files"
+				   (item is a file path) or "sequences" (item is a sequence dict), and folder
+				   holds the vendor, scene, shot and resolution of the item.
+		"""
+		for source in self.sources:
+			if date is not None and source["date"] != date:
+				continue
+			base_path = source["path"]
 			if not os.path.exists(base_path):
 				logging.error(f"Error: Path '{base_path}' does not exist.")
-				return
+				continue
+			job_metadata = dict(self.data, project=source["project"], input_date=source["date"])
+			job_key = (source["project"], source["date"])
+			with self._results_lock:
+				self.results.setdefault(job_key, {"files": 0, "sequences": 0, "failed": 0})
+			layout = self.layouts.get(source["vendor"], self.layouts["default"])
+			scene_metadata = {}  # SC folder path -> job metadata merged with its shot mapping, None without csv
+
+			def on_error(error, path, scene, scene_path, shot, source=source):
+				if record_failures and self.rerun_wanted(source, scene, shot):
+					self.record_discovery_failure(source, scene, shot, path, error)
+				else:
+					logging.warning(f"Could not read {path}: {error}")
+
 			try:
-				current_scene = None
-				current_shot = None
-				for root, dirs, _ in os.walk(base_path):
-					for folder_name in dirs:
-						# Find scene_shot folders (e.g., 48_14)
-						sc_match = re.match(r"^SC_(\d+)", folder_name)
-						if sc_match:
-							scene = sc_match.group(1)
-							current_scene = scene
-							status = self.readCSV(os.path.join(root, f"SC_{current_scene}"))
-						
-						scene_shot_match = re.match(rf"{current_scene}_([A-Za-z0-9_\-]+)", folder_name)
-						if status and scene_shot_match:
-							current_shot = scene_shot_match.group(1)
-							scene_shot_path = os.path.join(root, folder_name)
-                            # Find resolution folders (e.g., 4448x3086) inside scene_shot folders
-							for sub_dir_name in os.listdir(scene_shot_path):
-								sub_dir_path = os.path.join(scene_shot_path, sub_dir_name)
-								if os.path.isdir(sub_dir_path): 
-									resolution_match = re.match(r"\d+x\d+", sub_dir_name)
-									if resolution_match:
-										resolution = resolution_match.group(0)
-										files, sequences = get_files_and_sequences(sub_dir_path,current_scene, current_shot, resolution)
-										if files:
-											file_tasks.append(files)
-										if sequences:
-
-											sequence_tasks.append(sequences)
+				for folder in layout.iter_resolution_folders(base_path, self.discovery.execute, on_error):
+					scene, shot = folder["scene"], folder["shot"]
+					if not self.rerun_wanted(source, scene, shot):
+						continue
+					scene_path = folder["scene_path"]
+					if scene_path not in scene_metadata:
+						try:
+							with span("csv"):
+								mapping = self.discovery.call(self.readCSV, scene_path)
+						except Exception as e:
+							on_error(e, scene_path, scene, scene_path, None)
+							mapping = None
+						scene_metadata[scene_path] = dict(job_metadata, **mapping) if mapping is not None else None
+					metadata = scene_metadata[scene_path]
+					if metadata is None:
+						continue
+					priority = self.shot_priority(metadata, scene, shot)
+					if interactive is not None and interactive != (priority == INTERACTIVE_PRIORITY):
+						continue
+					if not self.claim_shot(source, metadata, scene, shot):
+						continue
+					folder = dict(folder, vendor=source["vendor"])
+					try:
+						with span("sequence_detection"):
+							files, sequences = self.discovery.call(
+								self.scan_shot, folder["path"], scene, shot, folder["resolution"], layout.frame_regex
+							)
+					except Exception as e:
+						on_error(e, folder["path"], scene, scene_path, shot)
+						continue
+					for file_path, size in files:
+						yield "files", priority, size, job_key, metadata, file_path, folder
+					for seq, cost in sequences:
+						yield "sequences", priority, cost, job_key, metadata, seq, folder
 			except Exception as e:
-				logging.error(f"An error occurred: {e}")
-			
-		
-		# Run file and sequence copy tasks in parallel
-		with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
-			# File copy tasks
-			all_files = [file_path for files_list in file_tasks for file_path in files_list]
-			file_futures = [executor.submit(self.copy_file, file_path) for file_path in all_files]
-			all_sequences = [seq for seq_list in sequence_tasks for seq in seq_list]
-			# Sequence copy tasks
-			sequence_futures = [
-				executor.submit(
-					SequenceBuilder(
-						sequence=seq,
-						copy_op=self.copy_op,
-						proxy_op=self.proxy_op,
-						mov_op=self.mov_op
-					).build, False, self.data
-				) for seq in all_sequences
-			]
-			# Wait for all to finish
-			for future in concurrent.futures.as_completed(file_futures + sequence_futures):
-				future.result()
+				on_error(e, base_path, None, None, None)
+
+	def scan_shot(self, path, scene, shot, resolution, frame_regex=None):
+		"""
+		Detects the files and sequences of a resolution folder and sizes them.
+
+		Returns:
+			tuple: ([(file path, size)], [(sequence, total size)]).
+		"""
+		files, sequences = get_files_and_sequences(path, scene, shot, resolution, frame_regex)
+		return (
+			[(file_path, os.path.getsize(file_path)) for file_path in files],
+			[(seq, sum(os.path.getsize(frame) for frame in seq['paths'])) for seq in sequences],
+		)
+
+	def rerun_wanted(self, source, scene, shot):
+		"""
+		Returns True unless a --rerun_failures run leaves out the scene and shot.
+		A scene or shot of None, in the failure list or here, covers every one.
+		"""
+		if self.rerun_shots is None:
+			return True
+		for project, vendor, date_str, failed_scene, failed_shot in self.rerun_shots:
+			if (project, vendor, date_str) != (source["project"], source["vendor"], source["date"]):
+				continue
+			if scene is None or failed_scene is None:
+				return True
+			if failed_scene == scene and (shot is None or failed_shot is None or failed_shot == shot):
+				return True
+		return False
+
+	def record_discovery_failure(self, source, scene, shot, path, error):
+		"""
+		Records a scene or shot that could not be discovered as a failed task, so
+		it is reported and --rerun_failures picks it up.
+
+		Args:
+			source (dict): The project/vendor/date source.
+			scene (str): The scene, None if the source itself could not be listed.
+			shot (str): The shot, None for a whole scene.
+			path (str): The folder or file that could not be read.
+			error (Exception): The error.
+		"""
+		shot_key = (source["project"], source["vendor"], source["date"], scene, shot)
+		if shot_key in self.discovery_failures:
+			# Found again by a later pass over the sources
+			return
+		self.discovery_failures.add(shot_key)
+		result = OperationResult(
+			project=source["project"], date=source["date"], vendor=source["vendor"],
+			scene=scene, shot=shot, kind="discovery", item=path,
+			status="failed", stage="discovery", error=str(error) or type(error).__name__,
+		)
+		logging.error(f"Discovery failed for {scene or '*'}/{shot or '*'} ({source['vendor']} {source['project']} {source['date']}) at {path}: {error}")
+		self.run_results.add(result)
+		with self._results_lock:
+			self.results[(source["project"], source["date"])]["failed"] += 1
+		self.emit(
+			"task_failed", project=source["project"], date=source["date"], vendor=source["vendor"],
+			scene=scene, shot=shot, kind=result.kind, item=path, stage=result.stage, error=result.error,
+		)
+
+	def record_result(self, job_key, result, future):
+		"""
+		Counts a finished task against its project and date, and records its
+		OperationResult for the per-shot and per-vendor summary.
+
+		Args:
+			job_key (tuple): (project, date) of the task.
+			result (OperationResult): The task's result, filled in by run_task.
+			future (concurrent.futures.Future): The finished task.
+		"""
+		try:
+			future.result()
+		except Exception as e:
+			logging.error(f"Task failed for {result.scene}/{result.shot} ({result.vendor} {job_key[0]} {job_key[1]}) in {result.stage}: {e}")
+			result.status = "failed"
+			result.error = str(e) or type(e).__name__
+		self.run_results.add(result)
+		with self._results_lock:
+			self.results[job_key]["failed" if result.status == "failed" else result.kind] += 1
+			self._pending_tasks -= 1
+			self._results_lock.notify_all()
+		self.emit(
+			"task_failed" if result.status == "failed" else "task_done",
+			project=job_key[0], date=job_key[1], vendor=result.vendor, scene=result.scene, shot=result.shot,
+			kind=result.kind, item=result.item, stage=result.stage, error=result.error,
+		)
+
+	def claim_shot(self, source, metadata, scene, shot):
+		"""
+		Claims the destination shot folder of a delivered shot for its vendor.
+
+		Args:
+			source (dict): The project/vendor/date source of the shot.
+			metadata (dict): The job metadata including the SC folder CSV mapping.
+			scene (str): The scene number.
+			shot (str): The shot name as received.
+
+		Returns:
+			bool: False if another vendor's delivery of the same date writes that folder.
+		"""
+		values = metadata.get(f"{scene}/{shot}")
+		if not values or len(values) < 2:
+			# No output path, the shot fails when its task runs
+			return True
+		key = (source["project"], source["date"], values[0], values[1])
+		owner = self.shot_owners.setdefault(key, source["vendor"])
+		if owner == source["vendor"]:
+			return True
+		shot_key = (source["project"], source["vendor"], source["date"], scene, shot)
+		if shot_key in self.skipped_shots:
+			return False
+		self.skipped_shots.add(shot_key)
+		logging.warning(
+			f"Skipping {scene}/{shot} of {source['vendor']} {source['date']}: "
+			f"{values[0]}{values[1]} is already delivered by {owner} on that date"
+		)
+		return False
+
+	def shot_priority(self, metadata, scene, shot):
+		"""
+		Returns the scheduling priority of a shot, lower runs first.
+
+		Shots listed with --priority_shots (by received code, e.g. 48/14, or renamed
+		code) are interactive. Otherwise the optional fourth CSV column sets the
+		priority, starting at 1.
+
+		Args:
+			metadata (dict): The job metadata including the SC folder CSV mapping.
+			scene (str): The scene number.
+			shot (str): The shot name as received.
+
+		Returns:
+			int: The priority.
+		"""
+		key = f"{scene}/{shot}"
+		values = metadata.get(key) or []
+		if key in self.priority_shots or (values and values[0] in self.priority_shots):
+			return INTERACTIVE_PRIORITY
+		if len(values) > 2 and values[2].isdigit():
+			return max(int(values[2]), INTERACTIVE_PRIORITY + 1)
+		return DEFAULT_PRIORITY
+
+	def display_date_results(self):
+		"""Logs the files, sequences and failures processed for every project and date."""
+		for (project, date_str), counts in sorted(self.results.items()):
+			logging.info(
+				f"Ingest {project} {date_str}: {counts['sequences']} sequences, "
+				f"{counts['files']} files, {counts['failed']} failed"
+			)
 
 	def readCSV(self, path):
+		"""
+		Reads the shot mapping CSV of a SC folder.
+
+		Mappings are cached by CSV content, so a CSV a vendor resends unchanged with
+		every date is parsed once per run.
+
+		Args:
+			path (str): The SC folder containing the csv file.
+
+		Returns:
+			dict or None: The shot mapping, or None if the folder has no csv file.
+		"""
 		from os import listdir
 		files= [f for f in listdir(path) if f.endswith(".csv")]
-		
+
+		mapping = None
 		if len(files):
-			reader_no_header = MVLCSVReader(os.path.join(path,files[0]))
+			csv_path = os.path.join(path,files[0])
+			with open(csv_path, 'rb') as csv_file:
+				digest = hashlib.sha1(csv_file.read()).hexdigest()
+			if digest in self.csv_cache:
+				return self.csv_cache[digest]
+			reader_no_header = MVLCSVReader(csv_path)
 			reader_no_header.read_csv(skip_header=False)
 			# Create mapping where the first column is the key (no header)
 			mapping = reader_no_header.create_dictionary_mapping(skip_header=False)
-			for key, values in mapping.items():
-				self.data[key] = values
+			self.csv_cache[digest] = mapping
 		else:
 			logging.info(f"No csv file found at {path}!")
-			return False
-		
-		return True
-        
+
+		return mapping
+
 	def parse_filename(self, filename):
 		"""Parses the filename and returns the extracted information."""
 		pattern = r"^(i|O)_([A-Za-z0-9]+)_(\d+-\d+)(?:_([A-Za-z0-9]+))?_v(\d+)$"
@@ -230,23 +890,53 @@ class MVLIngestionProcessor():
 		else:
 			return None
 
-	def copy_file(self, file_path):
+	def copy_file(self, file_path, metadata=None, folder=None):
 		"""
-			Copies a single file to the output path.
+			Copies a single file, under its own name, into the plate folder of its shot.
 			Args:
 				file_path(str) : path of the file to copy
+				metadata(dict) : job metadata, defaults to the processor data
+				folder(dict) : scene, shot and resolution of the file
+			Raises:
+				IngestionError: If the shot has no output path.
+		"""
+		metadata = metadata or self.data
+		plate_path = self.file_plate_path(file_path, metadata, folder)
+		self.copy_op.execute(file_path, plate_path, metadata.get('overwrite', False))
+
+	def file_plate_path(self, file_path, metadata, folder):
+		"""
+		Returns the destination of a single file: the plate folder of its shot, under its own name.
+
+		Raises:
+			IngestionError: If the shot has no output path.
+		"""
+		extension = os.path.splitext(file_path)[1].lstrip('.').lower()
+		output_path = generate_sequence_output_paths(folder or {}, metadata, frame_number=1001, ext=extension)  # 1001 for single files
+		if not output_path:
+			raise IngestionError(f"Could not generate an output path for {file_path}")
+		return os.path.join(os.path.dirname(output_path['plate']), os.path.basename(file_path))
+
+	def plate_folder(self, kind, item, metadata, folder):
+		"""
+		Returns the plate folder an ingest task writes to.
+
+		Args:
+			kind (str): "files" or "sequences".
+			item (str or dict): The file path or the sequence.
+			metadata (dict): The job metadata including the SC folder CSV mapping.
+			folder (dict): Scene, shot and resolution of the item.
+
+		Returns:
+			str or None: The folder, or None if the shot has no output path.
 		"""
 		try:
-			base_name, extension = os.path.splitext(os.path.basename(file_path))
-			output_path = generate_output_paths(1001, extension.lower(), self.data)  # 1001 for single files
-			plate_path = output_path['plate']
-			if output_path:
-				os.makedirs(os.path.dirname(plate_path), exist_ok=True)
-				shutil.copy2(file_path, plate_path)
-				logging.info(f"Copied file: {os.path.basename(file_path)} to {plate_path}")
-		except Exception as e:
-			error_msg = f"Error copying file {os.path.basename(file_path)}: {e}"
-			return False
+			if kind == "files":
+				return os.path.dirname(self.file_plate_path(item, metadata, folder))
+			output_paths = generate_sequence_output_paths(item, metadata, frame_number=metadata.get('start_frame', 1001), ext='exr')
+		except (IngestionError, TypeError):
+			return None
+		return os.path.dirname(output_paths['plate']) if output_paths else None
 
 	def copy_sequences(self, sequences):
 		"""
@@ -261,7 +951,8 @@ class MVLIngestionProcessor():
 					sequence=seq,
 					copy_op=self.copy_op,
 					proxy_op=self.proxy_op,
-					mov_op=self.mov_op
+					mov_op=self.mov_op,
+					num_workers=self.max_workers,
 				)
 				builder.build(False, self.data)
 
@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import logging
+import datetime
+import threading
+import contextlib
+import collections
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
+)
+
+DEFAULT_SAMPLE_INTERVAL = 0.01  # seconds between stack samples
+
+_active = None  # the running Profiler, spans are no-ops without one
+
+
+def span(name):
+    """
+    Times a pipeline stage while a Profiler runs, e.g. `with span("copy"):`.
+    Costs one global lookup when profiling is off.
+
+    Args:
+        name (str): The stage name.
+    """
+    profiler = _active
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.span(name)
+
+
+class Profiler:
+    """
+    Profiles an ingest run.
+
+    The main thread and every thread started while the profiler runs get
+    their own cProfile, merged into one pstats file at the end. A sampling
+    thread records the stacks of all threads, including pool threads started
+    earlier, as flamegraph collapsed stacks. Stages wrapped in span() are
+    timed. Worker processes are not profiled.
+
+    Writes profile_<ts>.prof, stacks_<ts>.collapsed and spans_<ts>.json.
+    """
+    def __init__(self, output_dir, interval=DEFAULT_SAMPLE_INTERVAL):
+        """
+        Args:
+            output_dir (str): Folder the profiles are written to.
+            interval (float, optional): Seconds between stack samples. Defaults to DEFAULT_SAMPLE_INTERVAL.
+        """
+        self.output_dir = output_dir
+        self.interval = interval
+        self.main_profile = cProfile.Profile()
+        self.thread_profiles = []
+        self.stacks = collections.Counter()  # collapsed stack -> samples
+        self.spans = {}  # stage -> [count, total seconds, max seconds]
+        self.samples = 0
+        self._stop = threading.Event()
+        self._sampler = None
+        self._lock = threading.Lock()
+        self._started = None
+
+    def start(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("A profiler is already running")
+        _active = self
+        self._started = time.monotonic()
+        self._sampler = threading.Thread(target=self._sample, name="gargantua-profiler", daemon=True)
+        self._sampler.start()
+        threading.setprofile(self._profile_thread)
+        self.main_profile.enable()
+
+    def stop(self):
+        """
+        Stops profiling and writes the profiles.
+
+        Returns:
+            dict: The written file paths, by kind.
+        """
+        global _active
+        self.main_profile.disable()
+        threading.setprofile(None)
+        self._stop.set()
+        self._sampler.join()
+        _active = None
+        return self.write()
+
+    def _profile_thread(self, frame, event, arg):
+        # Runs once in every new thread: swap the Python hook for a C profiler
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Interpreters with a single process-wide profiler slot: rely on the samples
+            return
+        with self._lock:
+            self.thread_profiles.append(profile)
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                # Pool threads are numbered, group them by pool
+                stack.append(names.get(thread_id, "thread").rstrip("0123456789_-"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    @contextlib.contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry = self.spans.setdefault(name, [0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] = max(entry[2], elapsed)
+
+    def write(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        paths = {
+            'profile': os.path.join(self.output_dir, f"profile_{stamp}.prof"),
+            'stacks': os.path.join(self.output_dir, f"stacks_{stamp}.collapsed"),
+            'spans': os.path.join(self.output_dir, f"spans_{stamp}.json"),
+        }
+
+        stats = pstats.Stats(self.main_profile)
+        with self._lock:
+            thread_profiles = list(self.thread_profiles)
+        for profile in thread_profiles:
+            try:
+                stats.add(profile)
+            except TypeError:
+                # The thread never made a profiled call
+                continue
+        stats.dump_stats(paths['profile'])
+
+        with open(paths['stacks'], 'w', encoding='utf-8') as stacks_file:
+            for stack, count in self.stacks.most_common():
+                stacks_file.write(f"{stack} {count}\n")
+
+        wall = time.monotonic() - self._started
+        spans = {
+            name: {'count': count, 'total_s': round(total, 6), 'mean_s': round(total / count, 6), 'max_s': round(longest, 6)}
+            for name, (count, total, longest) in sorted(self.spans.items(), key=lambda item: -item[1][1])
+        }
+        with open(paths['spans'], 'w', encoding='utf-8') as spans_file:
+            json.dump({'wall_s': round(wall, 6), 'samples': self.samples, 'spans': spans}, spans_file, indent=1)
+
+        logging.info(f"Profiled {wall:.2f}s, {len(thread_profiles) + 1} threads, {self.samples} stack samples")
+        for name, entry in spans.items():
+            # Spans of concurrent stages add up to more than the wall time
+            logging.info(
+                f"  {name}: {entry['total_s']:.3f}s in {entry['count']} spans "
+                f"(mean {entry['mean_s'] * 1000:.2f}ms, max {entry['max_s'] * 1000:.2f}ms)"
+            )
+        logging.info(f"Profiles written to {self.output_dir}: {', '.join(os.path.basename(path) for path in paths.values())}")
+        return paths
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
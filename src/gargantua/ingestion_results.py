@@ -0,0 +1,147 @@
+import os
+import json
+import logging
+import datetime
+import threading
+import dataclasses
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
+)
+
+FAILURES_VERSION = 1
+
+
+@dataclasses.dataclass
+class OperationResult:
+    """Outcome of one ingest task, a sequence or a single file of a shot."""
+    project: str
+    date: str
+    vendor: str
+    scene: str | None  # None when the source folder itself could not be discovered
+    shot: str | None  # None for a whole scene
+    kind: str  # "sequences", "files" or "discovery"
+    item: str  # file path, sequence name or the folder discovery failed on
+    status: str = "ok"  # "ok" or "failed"
+    stage: str | None = None  # operation that failed: discovery, copy, validate, proxy, mov
+    error: str | None = None
+    frames: int = 0
+    seconds: float = 0.0
+
+    @property
+    def shot_key(self):
+        return (self.project, self.vendor, self.date, self.scene, self.shot)
+
+
+class RunResults:
+    """
+    Collects the OperationResult of every task of a run and rolls them up per
+    shot and per vendor. The failures are written as a JSON list that
+    --rerun_failures turns back into a run of just those shots.
+    """
+    def __init__(self):
+        self.results = []
+        self._lock = threading.Lock()
+
+    def add(self, result):
+        with self._lock:
+            self.results.append(result)
+
+    def by_shot(self):
+        """
+        Returns:
+            dict: (project, vendor, date, scene, shot) -> {'ok', 'failed', 'frames', 'seconds', 'errors'}.
+        """
+        shots = {}
+        with self._lock:
+            for result in self.results:
+                entry = shots.setdefault(result.shot_key, {'ok': 0, 'failed': 0, 'frames': 0, 'seconds': 0.0, 'errors': []})
+                entry[result.status] += 1
+                entry['frames'] += result.frames
+                entry['seconds'] += result.seconds
+                if result.error:
+                    entry['errors'].append(f"{result.stage}: {result.error}")
+        # Discovery failures of a whole source or scene have no scene or shot
+        return dict(sorted(shots.items(), key=lambda item: tuple(value or "" for value in item[0])))
+
+    def by_vendor(self):
+        """
+        Returns:
+            dict: (project, vendor, date) -> {'shots', 'failed_shots', 'ok', 'failed', 'frames'}.
+        """
+        vendors = {}
+        for (project, vendor, date, scene, shot), entry in self.by_shot().items():
+            summary = vendors.setdefault((project, vendor, date), {'shots': 0, 'failed_shots': 0, 'ok': 0, 'failed': 0, 'frames': 0})
+            summary['shots'] += 1
+            summary['failed_shots'] += bool(entry['failed'])
+            for key in ('ok', 'failed', 'frames'):
+                summary[key] += entry[key]
+        return vendors
+
+    def failures(self):
+        with self._lock:
+            return [result for result in self.results if result.status == "failed"]
+
+    def log_summary(self):
+        """Logs the per-vendor roll-up and every failed shot."""
+        for (project, vendor, date), summary in sorted(self.by_vendor().items()):
+            logging.info(
+                f"Vendor {vendor} {project} {date}: {summary['shots'] - summary['failed_shots']}/{summary['shots']} shots ok, "
+                f"{summary['frames']} frames, {summary['failed']} failed tasks"
+            )
+        for (project, vendor, date, scene, shot), entry in self.by_shot().items():
+            if entry['failed']:
+                logging.error(f"Shot {scene or '*'}/{shot or '*'} ({vendor} {project} {date}) failed: {'; '.join(entry['errors'])}")
+
+    def write(self, folder, options):
+        """
+        Writes results_<ts>.json, and failures_<ts>.json when anything failed.
+
+        Args:
+            folder (str): The report folder.
+            options (dict): The job options, stored with the failures so they can be re-run.
+
+        Returns:
+            str or None: The failure list path, if one was written.
+        """
+        os.makedirs(folder, exist_ok=True)
+        stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        report = {
+            'vendors': [dict(zip(('project', 'vendor', 'date'), key), **summary) for key, summary in self.by_vendor().items()],
+            'shots': [dict(zip(('project', 'vendor', 'date', 'scene', 'shot'), key), **entry) for key, entry in self.by_shot().items()],
+            'operations': [dataclasses.asdict(result) for result in self.results],
+        }
+        with open(os.path.join(folder, f"results_{stamp}.json"), 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=1, default=str)
+        failures = self.failures()
+        if not failures:
+            return None
+        failures_path = os.path.join(folder, f"failures_{stamp}.json")
+        with open(failures_path, 'w', encoding='utf-8') as failures_file:
+            json.dump({
+                'version': FAILURES_VERSION,
+                'options': {key: value for key, value in options.items() if key != 'rerun_failures'},
+                'failures': [dataclasses.asdict(result) for result in failures],
+            }, failures_file, indent=1, default=str)
+        logging.error(f"{len(failures)} tasks failed, re-run them with --rerun_failures {failures_path}")
+        return failures_path
+
+
+def load_failures(path):
+    """
+    Reads a failure list written by RunResults.write.
+
+    Args:
+        path (str): The failures JSON.
+
+    Returns:
+        tuple: (job options, set of (project, vendor, date, scene, shot) to re-run).
+    """
+    with open(path, 'r', encoding='utf-8') as failures_file:
+        data = json.load(failures_file)
+    shots = {
+        (failure['project'], failure['vendor'], failure['date'], failure['scene'], failure['shot'])
+        for failure in data.get('failures', [])
+    }
+    return data.get('options', {}), shots
@@ -0,0 +1,198 @@
+import os
+import time
+import errno
+import random
+import logging
+import threading
+
+from .ingestion_operations import FileOperation
+from .ingestion_utils import IngestionError
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
+)
+
+# errno values a NAS mount returns while it is briefly unreachable or overloaded
+TRANSIENT_ERRNOS = {
+    errno.EIO, errno.EAGAIN, errno.EBUSY, errno.EINTR, errno.ETIMEDOUT, errno.ESTALE,
+    errno.ECONNRESET, errno.ECONNABORTED, errno.ECONNREFUSED, errno.EHOSTDOWN,
+    errno.EHOSTUNREACH, errno.ENETDOWN, errno.ENETUNREACH, errno.ENETRESET,
+}
+
+
+class MountUnavailableError(IngestionError):
+    """Raised without touching the mount while its circuit breaker is open."""
+
+
+def is_transient(error):
+    """Returns True for I/O errors worth retrying."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return isinstance(error, OSError) and error.errno in TRANSIENT_ERRNOS
+
+
+def mount_point(path):
+    """
+    Returns the mount point a path lives on.
+
+    Args:
+        path (str): A file or folder, which does not need to exist.
+
+    Returns:
+        str: The closest parent that is a mount point.
+    """
+    path = os.path.abspath(path)
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a mount after repeated transient failures.
+
+    After threshold consecutive failures the breaker opens and calls fail fast
+    for cooldown seconds. Then one call is let through: success closes the
+    breaker, failure opens it for another cooldown.
+    """
+    def __init__(self, name, threshold=5, cooldown=30.0):
+        """
+        Args:
+            name (str): Name used in log messages, the mount point.
+            threshold (int, optional): Consecutive failures that open the breaker. Defaults to 5.
+            cooldown (float, optional): Seconds the breaker stays open. Defaults to 30.
+        """
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_at = None  # when a call started probing the mount after the cooldown
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self):
+        """Returns True if a call may go to the mount."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at < self.cooldown:
+                return False
+            if self.trial_at is not None and now - self.trial_at < self.cooldown:
+                return False
+            self.trial_at = now
+            return True
+
+    def success(self):
+        with self._lock:
+            if self.opened_at is not None:
+                logging.info(f"Mount {self.name} is reachable again, closing circuit breaker")
+            self.failures = 0
+            self.opened_at = None
+            self.trial_at = None
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_at is not None or (self.opened_at is None and self.failures >= self.threshold):
+                logging.error(
+                    f"Mount {self.name} failed {self.failures} times in a row, "
+                    f"pausing its operations for {self.cooldown:g}s"
+                )
+                self.opened_at = time.monotonic()
+            self.trial_at = None
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per mount point, created on first use."""
+    def __init__(self, threshold=5, cooldown=30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.breakers = {}
+        self.mounts = {}  # folder -> mount point, frames of a folder share one lookup
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        folder = os.path.dirname(os.path.abspath(path))
+        mount = self.mounts.get(folder)
+        if mount is None:
+            mount = self.mounts[folder] = mount_point(folder)
+        with self._lock:
+            breaker = self.breakers.get(mount)
+            if breaker is None:
+                breaker = self.breakers[mount] = CircuitBreaker(mount, self.threshold, self.cooldown)
+            return breaker
+
+
+class RetryingFileOperation(FileOperation):
+    """
+    Retries an operation on transient I/O errors with exponential backoff and
+    jitter, and fails fast while the circuit breaker of a mount it touches is
+    open. Other errors are raised straight away.
+    """
+    def __init__(self, op, retries=3, base_delay=0.5, max_delay=30.0, breakers=None):
+        """
+        Args:
+            op (FileOperation): The operation to run.
+            retries (int, optional): Retries after the first attempt. Defaults to 3.
+            base_delay (float, optional): Seconds before the first retry, doubled for each further one. Defaults to 0.5.
+            max_delay (float, optional): Upper bound of a retry delay. Defaults to 30.
+            breakers (CircuitBreakers, optional): Shared per-mount breakers. Defaults to new ones.
+        """
+        self.op = op
+        self.name = op.name
+        self.cpu_bound = op.cpu_bound
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breakers = breakers or CircuitBreakers()
+        self.retried = 0
+        self._lock = threading.Lock()
+
+    def execute(self, *args, **kwargs):
+        return self.call(self.op.execute, *args, **kwargs)
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Runs fn(*args, **kwargs) with the retries and circuit breakers of this
+        operation, e.g. other reads of the same step. The mounts are those of
+        the path arguments.
+        """
+        paths = [arg for arg in args if isinstance(arg, str) and os.sep in arg]
+        breakers = {breaker.name: breaker for breaker in map(self.breakers.get, paths)}
+        for breaker in breakers.values():
+            if not breaker.allow():
+                raise MountUnavailableError(f"Mount {breaker.name} is unavailable, skipped {self.name} of {paths[0]}")
+        attempt = 0
+        while True:
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not is_transient(e):
+                    raise
+                failed = self.breakers.get(e.filename) if isinstance(getattr(e, 'filename', None), str) else None
+                for breaker in ([failed] if failed else breakers.values()):
+                    breaker.failure()
+                if attempt >= self.retries or any(not breaker.allow() for breaker in breakers.values()):
+                    raise
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+                attempt += 1
+                with self._lock:
+                    self.retried += 1
+                logging.warning(f"Retrying {self.name} of {paths[0] if paths else args} in {delay:.1f}s ({attempt}/{self.retries}): {e}")
+                time.sleep(delay)
+                continue
+            for breaker in breakers.values():
+                breaker.success()
+            return result
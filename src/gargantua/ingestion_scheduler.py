@@ -0,0 +1,106 @@
+import itertools
+import logging
+import queue
+import threading
+import concurrent.futures
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
+)
+
+# Lower runs first. Interactive shots jump ahead of everything still queued.
+INTERACTIVE_PRIORITY = 0
+DEFAULT_PRIORITY = 100
+
+
+class PriorityScheduler:
+    """
+    A pool of worker threads that always starts the most urgent queued task next.
+
+    Tasks are ordered by priority, then by cost (shortest job first), then by
+    submission order. Running tasks are never interrupted, but a task submitted
+    with a higher priority runs before any queued task of lower priority.
+
+    With max_pending set, submit blocks while that many tasks are queued or
+    running, so a producer streaming tasks in never runs far ahead of the workers.
+    """
+    def __init__(self, max_workers=None, name="gargantua", max_pending=None):
+        """
+        Args:
+            max_workers (int, optional): Number of worker threads. Defaults to 4.
+            name (str, optional): Prefix of the worker thread names.
+            max_pending (int, optional): Bound on queued plus running tasks. Defaults to unbounded.
+        """
+        self.max_workers = max_workers or 4
+        self._pending = threading.Semaphore(max_pending) if max_pending else None
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._shutdown = False
+        self._threads = []
+        for i in range(self.max_workers):
+            thread = threading.Thread(target=self._worker, name=f"{name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, fn, *args, priority=DEFAULT_PRIORITY, cost=0, **kwargs):
+        """
+        Queues a task, blocking first if max_pending tasks are already pending.
+
+        Args:
+            fn (callable): The task.
+            priority (int, optional): Lower runs first. Defaults to DEFAULT_PRIORITY.
+            cost (int, optional): Tie-break within a priority, e.g. total bytes. Smaller runs first.
+
+        Returns:
+            concurrent.futures.Future: Resolved with the task result.
+        """
+        if self._shutdown:
+            raise RuntimeError("cannot submit after shutdown")
+        if self._pending:
+            self._pending.acquire()
+        future = concurrent.futures.Future()
+        self._queue.put((priority, cost, next(self._counter), future, fn, args, kwargs))
+        return future
+
+    def _worker(self):
+        while True:
+            _, _, _, future, fn, args, kwargs = self._queue.get()
+            if future is None:
+                return
+            try:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            finally:
+                if self._pending:
+                    self._pending.release()
+
+    def shutdown(self, wait=True):
+        """
+        Stops the workers once every queued task has run.
+
+        Args:
+            wait (bool, optional): Block until the workers exit. Defaults to True.
+        """
+        if self._shutdown:
+            return
+        self._shutdown = True
+        # Sentinels sort after every real task, so queued work is drained first.
+        for _ in self._threads:
+            self._queue.put((float('inf'), 0, next(self._counter), None, None, (), {}))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown(wait=True)
+        return False
@@ -0,0 +1,149 @@
+import os
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
+)
+
+DIGITS = "0123456789"
+FRAME_SEPARATORS = "_."
+
+
+def split_frame_name(file_name):
+    """
+    Splits a frame file name without a regex.
+
+    Handles both name_1001.exr and name.1001.exr.
+
+    Args:
+        file_name (str): The file name.
+
+    Returns:
+        tuple or None: (base name, separator, frame digits, extension), or None
+                       if the name is not a numbered frame.
+    """
+    stem, dot, ext = file_name.rpartition('.')
+    if not dot or not ext.isascii() or not ext.isalnum():
+        return None
+    base_sep = stem.rstrip(DIGITS)
+    if len(base_sep) < 2 or len(base_sep) == len(stem) or base_sep[-1] not in FRAME_SEPARATORS:
+        return None
+    return base_sep[:-1], base_sep[-1], stem[len(base_sep):], ext
+
+
+class FrameGroup:
+    """
+    Frames sharing a base name, separator and extension.
+
+    Contiguous ranges are merged as frames are added, so the frame order,
+    gaps and padding are known without sorting the frames.
+    """
+    def __init__(self, base_name, separator, extension):
+        self.base_name = base_name
+        self.separator = separator
+        self.extension = extension
+        self.frames = {}  # frame number -> path
+        self.starts = {}  # range start -> range end
+        self.ends = {}  # range end -> range start
+        self.widths = set()  # digit counts seen
+        self.padded_widths = set()  # digit counts of zero padded frame numbers
+        self.duplicates = []  # paths whose frame number was already seen
+
+    def add(self, digits, path):
+        frame = int(digits)
+        if frame in self.frames:
+            self.duplicates.append(path)
+            return
+        self.frames[frame] = path
+        self.widths.add(len(digits))
+        if len(digits) > 1 and digits[0] == '0':
+            self.padded_widths.add(len(digits))
+        start = self.ends.pop(frame - 1, frame)
+        end = self.starts.pop(frame + 1, frame)
+        self.starts.pop(start, None)
+        self.ends.pop(end, None)
+        self.starts[start] = end
+        self.ends[end] = start
+
+    @property
+    def padding(self):
+        return min(self.padded_widths) if self.padded_widths else min(self.widths)
+
+    @property
+    def padding_consistent(self):
+        padding = self.padding
+        return len(self.padded_widths) <= 1 and min(self.widths) >= padding and not self.duplicates
+
+    def ranges(self):
+        """Returns the contiguous (start, end) frame ranges in order."""
+        return sorted(self.starts.items())
+
+    def to_sequence(self, scene=None, shot=None, resolution=None):
+        ranges = self.ranges()
+        gaps = [(end + 1, next_start - 1) for (_, end), (next_start, _) in zip(ranges, ranges[1:])]
+        return {
+            'scene': scene,
+            'shot': shot,
+            'base_name': self.base_name,
+            'separator': self.separator,
+            'padding': self.padding,
+            'start': ranges[0][0],
+            'end': ranges[-1][1],
+            'extension': self.extension,
+            'paths': [self.frames[frame] for start, end in ranges for frame in range(start, end + 1)],
+            'ranges': ranges,
+            'gaps': gaps,
+            'padding_consistent': self.padding_consistent,
+            'resolution': resolution,
+        }
+
+
+def iter_files_and_sequences(root_dir, scene=None, shot=None, resolution=None):
+    """
+    Detects the single files and frame sequences of a directory in one listing pass.
+
+    Gaps and inconsistent padding are logged as each sequence is yielded.
+
+    Args:
+        root_dir (str): The directory to read.
+        scene (str, optional): Scene stored on the sequences.
+        shot (str, optional): Shot stored on the sequences.
+        resolution (str, optional): Resolution stored on the sequences.
+
+    Yields:
+        tuple: ("file", path) or ("sequence", sequence dict with paths in frame order).
+    """
+    groups = {}
+    with os.scandir(root_dir) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            parts = split_frame_name(entry.name)
+            if not parts:
+                yield "file", entry.path
+                continue
+            base_name, separator, digits, extension = parts
+            group = groups.get((base_name, separator, extension))
+            if group is None:
+                group = groups[(base_name, separator, extension)] = FrameGroup(base_name, separator, extension)
+            group.add(digits, entry.path)
+
+    for group in groups.values():
+        if len(group.frames) == 1:
+            # Only one file with this pattern, treat as single file
+            yield "file", next(iter(group.frames.values()))
+            yield from (("file", path) for path in group.duplicates)
+            continue
+        sequence = group.to_sequence(scene, shot, resolution)
+        name = f"{group.base_name}{group.separator}{'#' * sequence['padding']}.{group.extension}"
+        if sequence['gaps']:
+            missing = ", ".join(f"{start}-{end}" if start != end else f"{start}" for start, end in sequence['gaps'])
+            logging.warning(f"Sequence {name} in {root_dir} has missing frames: {missing}")
+        if not sequence['padding_consistent']:
+            logging.warning(
+                f"Sequence {name} in {root_dir} has inconsistent frame padding "
+                f"(widths {sorted(group.widths)}, {len(group.duplicates)} duplicate frame numbers)"
+            )
+        yield "sequence", sequence
+        yield from (("file", path) for path in group.duplicates)
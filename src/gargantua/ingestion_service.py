@@ -0,0 +1,211 @@
+import os
+import asyncio
+import logging
+import itertools
+import threading
+import dataclasses
+import concurrent.futures
+
+from .ingestion_processor import MVLIngestionProcessor
+from .ingestion_concurrency import AdaptiveConcurrencyController
+from .ingestion_scheduler import PriorityScheduler
+from .ingestion_retry import CircuitBreakers
+from .ingestion_executors import ExecutorRouter, DEFAULT_BATCH_SIZE
+from .ingestion_utils import IngestionError
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
+)
+
+__all__ = ["IngestJobConfig", "IngestionService", "IngestionError"]
+
+
+@dataclasses.dataclass
+class IngestJobConfig:
+    """
+    Options of one ingest or egress job, mirroring the command line arguments.
+    Projects and dates may be given as comma separated strings or lists.
+    """
+    destination: str
+    input_date: str | list[str] | None = None
+    source: str = "C:\\"
+    project: str | list[str] = "gen63"
+    process: int = 1
+    vendor: str = ""
+    data_type: str = "exr"
+    mov: bool = False
+    hires: bool = False
+    camera: str = ""
+    take: str = ""
+    resolution: str = "4448x3096"
+    force: bool = False
+    proxy_format: str | None = None
+    egress_format: str = "copy"
+    egress_shots: str | list[str] = ""
+    egress_plates: bool = False
+    dedup: str | None = None
+    priority_shots: str | list[str] = ""
+    block_size: float = 8
+    no_fadvise: bool = False
+    no_preallocate: bool = False
+    no_space_check: bool = False
+    layout_config: str | None = None
+    validate: bool = False
+    incremental: bool = False
+    incremental_hash: bool = False
+    retries: int = 3
+    retry_delay: float = 0.5
+    rerun_failures: str | None = None
+
+    def to_dict(self):
+        """Returns the options as the dict MVLIngestionProcessor works on."""
+        return dataclasses.asdict(self)
+
+
+class IngestionService:
+    """
+    Runs many ingest and egress jobs concurrently in one long-lived process.
+
+    Every job shares the service's task scheduler, frame copy pool, executor
+    router, concurrency controller and per-mount circuit breakers, so pools
+    are created once and a failing mount is paused for every job. Job failures come back
+    as exceptions on the returned futures, and progress events of all jobs can
+    be consumed with `async for event in service.events()`.
+    """
+    def __init__(self, max_workers=None, min_workers=1, max_jobs=4, adaptive=True, backends=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            max_workers (int, optional): Upper bound of concurrent copies. Defaults to the CPU count.
+            min_workers (int, optional): Lower bound of concurrent copies. Defaults to 1.
+            max_jobs (int, optional): Jobs discovering and waiting at the same time. Defaults to 4.
+            adaptive (bool, optional): Tune the number of concurrent copies. Defaults to True.
+            backends (str or dict, optional): Execution backend per operation, as for --backend.
+            batch_size (int, optional): Frames sent to a worker process per task. Defaults to DEFAULT_BATCH_SIZE.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 4
+        self.scheduler = PriorityScheduler(
+            max_workers=self.max_workers, name="gargantua-task", max_pending=self.max_workers * 4
+        )
+        self.frame_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="gargantua-copy"
+        )
+        self.controller = None
+        if adaptive:
+            self.controller = AdaptiveConcurrencyController(min_workers=min_workers, max_workers=self.max_workers)
+        self.router = ExecutorRouter(backends=backends, max_workers=self.max_workers, batch_size=batch_size)
+        self.breakers = CircuitBreakers()
+        self._jobs = concurrent.futures.ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="gargantua-job")
+        self._job_ids = itertools.count(1)
+        self._subscribers = []  # (loop, asyncio.Queue, job id or None)
+        self._lock = threading.Lock()
+
+    def submit(self, config):
+        """
+        Starts a job.
+
+        Args:
+            config (IngestJobConfig): The job options.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the job results, (project, date) -> counts,
+                or raises IngestionError. Its job_id attribute identifies the job's events.
+        """
+        job_id = next(self._job_ids)
+        options = dict(config.to_dict(), max_workers=self.max_workers, fixed_workers=self.controller is None)
+        processor = MVLIngestionProcessor(
+            options,
+            scheduler=self.scheduler,
+            frame_pool=self.frame_pool,
+            controller=self.controller,
+            router=self.router,
+            breakers=self.breakers,
+            progress=lambda event: self._publish(dict(event, job_id=job_id)),
+        )
+        future = self._jobs.submit(self._run, job_id, processor)
+        future.job_id = job_id
+        return future
+
+    async def run(self, config):
+        """
+        Runs a job and waits for it without blocking the event loop.
+
+        Args:
+            config (IngestJobConfig): The job options.
+
+        Returns:
+            dict: The job results, (project, date) -> counts.
+        """
+        return await asyncio.wrap_future(self.submit(config))
+
+    def _run(self, job_id, processor):
+        self._publish({"event": "job_started", "job_id": job_id})
+        try:
+            results = processor.execute()
+        except Exception as e:
+            self._publish({"event": "job_failed", "job_id": job_id, "error": str(e)})
+            if isinstance(e, IngestionError):
+                raise
+            raise IngestionError(f"Job {job_id} failed: {e}") from e
+        self._publish({"event": "job_finished", "job_id": job_id, "results": results})
+        return results
+
+    def _publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, events, job_id in subscribers:
+            if job_id is None or job_id == event.get("job_id"):
+                loop.call_soon_threadsafe(events.put_nowait, event)
+
+    async def events(self, job_id=None):
+        """
+        Streams progress events as dicts with an "event" key and the job_id.
+        Only events published after subscribing are seen, so start iterating
+        before submitting to see a job from its start.
+
+        Args:
+            job_id (int, optional): Only stream the events of this job.
+
+        Yields:
+            dict: The next event. Stops after job_finished/job_failed when job_id is given.
+        """
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(), job_id)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        try:
+            while True:
+                event = await subscriber[1].get()
+                yield event
+                if job_id is not None and event["event"] in ("job_finished", "job_failed"):
+                    return
+        finally:
+            with self._lock:
+                self._subscribers.remove(subscriber)
+
+    def close(self, wait=True):
+        """
+        Shuts the shared pools down.
+
+        Args:
+            wait (bool, optional): Wait for running jobs to finish. Defaults to True.
+        """
+        self._jobs.shutdown(wait=wait)
+        self.scheduler.shutdown(wait=wait)
+        self.frame_pool.shutdown(wait=wait)
+        self.router.shutdown(wait=wait)
+        if self.controller:
+            self.controller.summary()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+        return False
@@ -2,6 +2,9 @@
 import os
 import re
 import logging
+import datetime
+
+from .ingestion_sequences import iter_files_and_sequences
 #import OpenEXR
 #import Imath
 
@@ -10,6 +13,58 @@ logging.basicConfig(
     format='%(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s'
 )
 
+class IngestionError(Exception):
+    """Raised when an ingest or egress job cannot run or a shot cannot be processed."""
+
+
+def split_list(value):
+    """
+    Splits a comma separated command line value into a list of stripped, non-empty items.
+
+    Args:
+        value (str or list): The raw value, e.g. "gen63,gen64".
+
+    Returns:
+        list: The individual items, in the given order and without duplicates.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    items = []
+    for item in value:
+        item = str(item).strip()
+        if item and item not in items:
+            items.append(item)
+    return items
+
+def parse_input_dates(value):
+    """
+    Expands an input date specification into the list of dates it covers.
+
+    Accepts a single date (20250101), a comma separated list (20250101,20250103),
+    inclusive ranges (20250101-20250105) or any mix of those.
+
+    Args:
+        value (str): The date specification.
+
+    Returns:
+        list: Sorted, unique dates as YYYYMMDD strings.
+
+    Raises:
+        ValueError: If any date is malformed or a range ends before it starts.
+    """
+    dates = set()
+    for item in split_list(value):
+        start_str, _, end_str = item.partition('-')
+        start = datetime.datetime.strptime(start_str.strip(), "%Y%m%d").date()
+        end = datetime.datetime.strptime(end_str.strip(), "%Y%m%d").date() if end_str else start
+        if end < start:
+            raise ValueError(f"date range {item} ends before it starts")
+        for offset in range((end - start).days + 1):
+            dates.add((start + datetime.timedelta(days=offset)).strftime("%Y%m%d"))
+    return sorted(dates)
+
 def generate_sequence_output_paths(seq, metadata, frame_number=1001, ext='exr'):
     current_shot = seq.get("shot")
     if not current_shot:
@@ -53,11 +108,9 @@ def generate_sequence_output_paths(seq, metadata, frame_number=1001, ext='exr'):
                 break
 
     if not matching_key:
-        logging.error(f"generate_output_paths : No matching key found for scene {current_scene} and shot {current_shot}")
-        exit(1)
+        raise IngestionError(f"generate_output_paths : No matching key found for scene {current_scene} and shot {current_shot}")
     if not metadata.get(matching_key):
-        logging.error(f"generate_output_paths : No metadata found for key {matching_key}")
-        exit(1)	
+        raise IngestionError(f"generate_output_paths : No metadata found for key {matching_key}")	
 
     scene_shot_data = metadata[matching_key][0]  # e.g. GEN63_SC_48_SH_0160
     scene_shot_type = metadata[matching_key][1]  # e.g. _main_plate_v001
@@ -138,9 +191,18 @@ def check_missing_frames(paths):
 
     return False
 
-def get_files_and_sequences(root_dirs, scene=None, shot=None, resolution=None):
+# Matches: basename_frame.ext (frame is one or more digits)
+SEQUENCE_REGEX = re.compile(r"^(?P<base>.+?)_(?P<frame>\d+)\.(?P<ext>[a-zA-Z0-9]+)$")
+
+def get_files_and_sequences(root_dirs, scene=None, shot=None, resolution=None, sequence_regex=None):
     """
     Reads a directory and identifies individual files and file sequences.
+    Args:
+        sequence_regex (re.Pattern, optional): Precompiled frame pattern with base,
+            frame and ext named groups (and optionally sep, the separator before the
+            frame number), for vendors with their own frame naming.
+            Defaults to the regex-free detector of ingestion_sequences, which
+            handles name_1001.ext and name.1001.ext.
     Returns:
         tuple: A tuple containing two lists:
             - files (list): A list of individual file paths.
@@ -148,12 +210,16 @@ def get_files_and_sequences(root_dirs, scene=None, shot=None, resolution=None):
     """
     files = []
     sequences = []
-    # Matches: basename_frame.ext (frame is one or more digits)
-    sequence_regex = re.compile(r"^(.+?)_(\d+)\.([a-zA-Z0-9]+)$")
 
     if not isinstance(root_dirs, list):
         root_dirs = [root_dirs]
 
+    if sequence_regex is None:
+        for root_dir in root_dirs:
+            for kind, item in iter_files_and_sequences(root_dir, scene, shot, resolution):
+                (sequences if kind == "sequence" else files).append(item)
+        return files, sequences
+
     for root_dir in root_dirs:
         all_items = sorted([os.path.join(root_dir, item) for item in os.listdir(root_dir)])
         # Group files by (base_name, extension, padding)
@@ -162,14 +228,15 @@ def get_files_and_sequences(root_dirs, scene=None, shot=None, resolution=None):
             if os.path.isfile(item_path):
                 match = sequence_regex.match(os.path.basename(item_path))
                 if match:
-                    base_name, frame_number_str, extension = match.groups()
+                    base_name, frame_number_str, extension = match.group("base", "frame", "ext")
+                    separator = match.groupdict().get("sep") or "_"
                     padding = len(frame_number_str)
-                    key = (base_name, extension, padding)
+                    key = (base_name, separator, extension, padding)
                     seq_groups.setdefault(key, []).append((int(frame_number_str), item_path))
                 else:
                     files.append(item_path)
         # Now process the groups
-        for (base_name, extension, padding), frames in seq_groups.items():
+        for (base_name, separator, extension, padding), frames in seq_groups.items():
             if len(frames) > 1:
                 frames_sorted = sorted(frames)
                 sequence_files = [f[1] for f in frames_sorted]
@@ -179,6 +246,7 @@ def get_files_and_sequences(root_dirs, scene=None, shot=None, resolution=None):
 					'scene': scene,
 					'shot': shot,
                     'base_name': base_name,
+                    'separator': separator,
                     'padding': padding,
                     'start': start_frame,
                     'end': end_frame,
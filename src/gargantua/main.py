@@ -1,6 +1,11 @@
 
+import sys
+import logging
 import argparse
 from .ingestion_processor import MVLIngestionProcessor
+from .ingestion_utils import IngestionError
+from .ingestion_executors import parse_backends, DEFAULT_BATCH_SIZE
+from .ingestion_profiling import Profiler, DEFAULT_SAMPLE_INTERVAL
 
 def parse_arguments():
 	"""
@@ -38,13 +43,13 @@ def parse_arguments():
 	parser.add_argument(
 		"--project",
 		type=str,
-		help="The name of the project.",
+		help="The name of the project, or a comma separated list of projects to ingest in one run.",
 		default="gen63",
 	)
 	parser.add_argument(
 		"--input_date",
 		type=str,
-		help="Date in YYYYMMDD format.",  # Changed format to be more standard
+		help="Date in YYYYMMDD format, a comma separated list of dates or an inclusive YYYYMMDD-YYYYMMDD range.",
 	)
 	parser.add_argument(
 		"--data_type",
@@ -62,7 +67,7 @@ def parse_arguments():
 		"--process",
 		type=int,
 		choices=[0, 1],
-		help="1: Ingest (copy files into folder structure), 0: Egress (copy files out - not yet implemented).",
+		help="1: Ingest (copy files into folder structure), 0: Egress (send files changed since the last egress to vault/from_mvl/<vendor>/<date>).",
 		default=1,
 	)
 	parser.add_argument(
@@ -108,13 +113,177 @@ def parse_arguments():
 		metavar="FORMAT",
 	)
 
+	parser.add_argument(
+		"--egress_format",
+		type=str,
+		choices=["copy", "tar"],
+		help="Egress as plain copies or as a single tar package per delivery.",
+		default="copy",
+	)
+	parser.add_argument(
+		"--egress_shots",
+		type=str,
+		help="Comma separated shot folders to egress, relative to work/sequences (e.g. SC_48/SH_0160,SC_49). Required for egress.",
+		default="",
+	)
+	parser.add_argument(
+		"--egress_plates",
+		action="store_true",
+		help="Also egress the plate folders ingest wrote to, as recorded in <destination>/.gargantua/plate_folders.json.",
+		default=False,
+	)
+
+	parser.add_argument(
+		"--dedup",
+		type=str,
+		choices=["link", "skip"],
+		help="Detect frames identical to already ingested plates and hard link (link) or not write (skip) them instead of copying. "
+			 "skip cannot be combined with --validate, --proxy_format or --mov.",
+		default=None,
+	)
+
+	parser.add_argument(
+		"--priority_shots",
+		type=str,
+		help="Optional: Comma separated shots to ingest first (e.g. 48/14 or GEN63_SC_48_SH_0160). Other shots use the optional fourth CSV column as priority, then run smallest first.",
+		default="",
+	)
+
+	parser.add_argument(
+		"--block_size",
+		type=float,
+		help="Copy block size in MiB.",
+		default=8,
+	)
+	parser.add_argument(
+		"--no_fadvise",
+		action="store_true",
+		help="Do not pass read-ahead and page cache hints to the kernel while copying.",
+		default=False,
+	)
+	parser.add_argument(
+		"--no_preallocate",
+		action="store_true",
+		help="Do not preallocate destination files. Filesystems without native preallocation, e.g. NFS before 4.2, are detected and skipped.",
+		default=False,
+	)
+	parser.add_argument(
+		"--no_space_check",
+		action="store_true",
+		help="Skip the up front check of destination free space against the bytes of the frames not yet at the destination. "
+			 "The check lists every frame before copying starts; --incremental and --rerun_failures runs skip it.",
+		default=False,
+	)
+
+	parser.add_argument(
+		"--min_workers",
+		type=int,
+		help="Lower bound of concurrent copies for the adaptive controller.",
+		default=1,
+	)
+	parser.add_argument(
+		"--max_workers",
+		type=int,
+		help="Upper bound of concurrent copies, and size of the worker pools. Defaults to the CPU count.",
+		default=None,
+	)
+	parser.add_argument(
+		"--fixed_workers",
+		action="store_true",
+		help="Disable the adaptive controller and always run --max_workers copies at once.",
+		default=False,
+	)
+
+	parser.add_argument(
+		"--layout_config",
+		type=str,
+		help="Optional: JSON file of per-vendor folder and frame naming patterns (scene, shot, resolution, frame).",
+		default=None,
+	)
+
+	parser.add_argument(
+		"--validate",
+		action="store_true",
+		help="Check the EXR header of every copied frame and record its checksum.",
+		default=False,
+	)
+	parser.add_argument(
+		"--backend",
+		type=parse_backends,
+		help="Optional: execution backend per operation, e.g. validate=process,proxy=thread. "
+			 "CPU-bound operations default to process, the others to thread.",
+		default=None,
+	)
+	parser.add_argument(
+		"--batch_size",
+		type=int,
+		help="Frames sent to a worker process per task.",
+		default=DEFAULT_BATCH_SIZE,
+	)
+
+	parser.add_argument(
+		"--incremental",
+		action="store_true",
+		help="Only copy frames whose source size or mtime changed since they were last ingested.",
+		default=False,
+	)
+	parser.add_argument(
+		"--incremental_hash",
+		action="store_true",
+		help="Like --incremental, but frames whose mtime changed and size did not are compared by full content hash, so re-exports of identical frames are not copied again.",
+		default=False,
+	)
+
+	parser.add_argument(
+		"--retries",
+		type=int,
+		help="Retries of a copy failing with a transient I/O error, with exponential backoff.",
+		default=3,
+	)
+	parser.add_argument(
+		"--retry_delay",
+		type=float,
+		help="Seconds before the first retry, doubled for every further retry.",
+		default=0.5,
+	)
+	parser.add_argument(
+		"--rerun_failures",
+		type=str,
+		help="Optional: failures_<timestamp>.json of an earlier run. Re-runs only its failed shots, with its job options.",
+		default=None,
+	)
+
+	parser.add_argument(
+		"--profile",
+		type=str,
+		metavar="DIR",
+		help="Optional: profile the run and write a merged cProfile, flamegraph collapsed stacks and stage timings to DIR.",
+		default=None,
+	)
+	parser.add_argument(
+		"--profile_interval",
+		type=float,
+		help="Seconds between stack samples with --profile.",
+		default=DEFAULT_SAMPLE_INTERVAL,
+	)
+
 	args = parser.parse_args()
 	return args
 
 def main():
 	args = parse_arguments()
 	processor = MVLIngestionProcessor(args)
-	processor.execute()
+	profiler = Profiler(args.profile, args.profile_interval) if args.profile else None
+	try:
+		if profiler:
+			profiler.start()
+		processor.execute()
+	except IngestionError as e:
+		logging.error(e)
+		sys.exit(1)
+	finally:
+		if profiler:
+			profiler.stop()
 
 if __name__=="__main__":
     main()
@@ -0,0 +1,92 @@
+import time
+import threading
+
+import pytest
+
+from gargantua.ingestion_concurrency import AdaptiveConcurrencyController
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("gargantua.ingestion_concurrency.time.monotonic", clock)
+    return clock
+
+
+def run_interval(controller, clock, nbytes):
+    """Records one interval of copying at nbytes per interval."""
+    clock.now += controller.interval
+    controller.record(nbytes, 0.1)
+
+
+def test_limit_starts_in_the_middle_of_the_bounds(clock):
+    assert AdaptiveConcurrencyController(min_workers=2, max_workers=8).limit == 5
+    assert AdaptiveConcurrencyController(min_workers=2, max_workers=8, initial=20).limit == 8
+
+
+def test_limit_climbs_while_throughput_improves(clock):
+    controller = AdaptiveConcurrencyController(min_workers=1, max_workers=8, initial=2)
+    for nbytes in (100, 200, 300):
+        run_interval(controller, clock, nbytes)
+    assert [decision[1:3] for decision in controller.decisions] == [(2, 3), (3, 4), (4, 5)]
+
+
+def test_limit_turns_around_when_throughput_drops(clock):
+    controller = AdaptiveConcurrencyController(min_workers=1, max_workers=8, initial=4)
+    for nbytes in (100, 200, 100):
+        run_interval(controller, clock, nbytes)
+    assert controller.limit == 5
+
+
+def test_flat_throughput_steps_down_to_the_lower_bound(clock):
+    controller = AdaptiveConcurrencyController(min_workers=2, max_workers=8, initial=4)
+    for _ in range(6):
+        run_interval(controller, clock, 100)
+    assert controller.limit == 2
+
+
+def test_no_adjustment_within_an_interval(clock):
+    controller = AdaptiveConcurrencyController(initial=3, interval=2.0)
+    controller.record(100, 0.1)
+    clock.now += 1.0
+    controller.record(100, 0.1)
+    assert controller.limit == 3
+    assert controller.decisions == []
+
+
+def test_slots_never_exceed_the_limit():
+    controller = AdaptiveConcurrencyController(min_workers=1, max_workers=2, initial=2)
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+    release = threading.Event()
+
+    def copy():
+        with controller.slot():
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            release.wait(5)
+            with lock:
+                in_flight.pop()
+
+    threads = [threading.Thread(target=copy) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while len(peak) < 2:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    assert len(peak) == 2
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert max(peak) <= 2
+    assert len(peak) == 5
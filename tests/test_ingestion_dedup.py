@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from gargantua.ingestion_dedup import ContentIndex
+from gargantua.ingestion_operations import DedupCopyFileOperation
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as out:
+        out.write(content)
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def dedup(tmp_path):
+    index = ContentIndex(str(tmp_path / "out" / ".gargantua" / "content_index.json"))
+    return DedupCopyFileOperation(index, "link"), tmp_path
+
+
+def test_redelivered_frame_is_linked(dedup):
+    op, tmp_path = dedup
+    first, second = str(tmp_path / "in" / "a.exr"), str(tmp_path / "in" / "b.exr")
+    write(first, b"x" * 5000)
+    write(second, b"x" * 5000)
+    op.execute(first, str(tmp_path / "out" / "v001" / "a.exr"))
+    op.execute(second, str(tmp_path / "out" / "v002" / "b.exr"))
+    assert os.path.samefile(tmp_path / "out" / "v001" / "a.exr", tmp_path / "out" / "v002" / "b.exr")
+    assert op.report() == {str(tmp_path / "in"): {'frames': 1, 'matches': [str(tmp_path / "out" / "v001")]}}
+
+
+def test_overwritten_destination_is_not_linked_to_by_its_old_content(dedup):
+    op, tmp_path = dedup
+    old, fix, again = (str(tmp_path / "in" / name) for name in ("old.exr", "fix.exr", "again.exr"))
+    write(old, b"a" * 5000)
+    write(fix, b"b" * 5000)
+    write(again, b"a" * 5000)
+    plate = str(tmp_path / "out" / "v001" / "plate.exr")
+    op.execute(old, plate)
+    # Caches the full hash of the old content
+    assert op.index.find(again)[0] == plate
+
+    op.execute(fix, plate, overwrite=True)
+    copy = str(tmp_path / "out" / "v002" / "plate.exr")
+    op.execute(again, copy)
+    assert read(plate) == b"b" * 5000
+    assert read(copy) == b"a" * 5000
+    assert not os.path.samefile(plate, copy)
+
+
+def test_index_round_trip(dedup):
+    op, tmp_path = dedup
+    src = str(tmp_path / "in" / "a.exr")
+    write(src, b"x" * 5000)
+    op.execute(src, str(tmp_path / "out" / "v001" / "a.exr"))
+    op.index.save()
+    index = ContentIndex(op.index.path)
+    assert index.loaded
+    assert index.find(src)[0] == str(tmp_path / "out" / "v001" / "a.exr")
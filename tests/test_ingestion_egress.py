@@ -0,0 +1,88 @@
+import os
+import tarfile
+
+import pytest
+
+from gargantua.ingestion_egress import EgressPackager, summarize_delta
+from gargantua.ingestion_operations import CopyFileOperation
+
+
+def write(path, content=b"frame"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as out:
+        out.write(content)
+
+
+@pytest.fixture
+def sequences(tmp_path):
+    """A work/sequences tree with a comp and a plate version of one shot."""
+    root = tmp_path / "work" / "sequences"
+    for frame in (1001, 1002):
+        write(os.path.join(root, "SC_48", "SH_0160", "main", "comp", "v001", f"comp_{frame}.exr"))
+        write(os.path.join(root, "SC_48", "SH_0160", "main", "plate", "v001", f"plate_{frame}.exr"))
+    return str(root), str(tmp_path / "vault" / "from_mvl" / "vendA")
+
+
+def packager(sequences, date_str="20250102", fmt="copy"):
+    source_root, vendor_root = sequences
+    return EgressPackager(source_root, vendor_root, date_str, CopyFileOperation(), fmt)
+
+
+def test_delta_is_empty_once_sent(sequences):
+    egress = packager(sequences)
+    delta, unchanged = egress.collect_delta(["SC_48/SH_0160"])
+    assert [rel_path for _, rel_path, _ in delta] == [
+        "SC_48/SH_0160/main/comp/v001/comp_1001.exr",
+        "SC_48/SH_0160/main/comp/v001/comp_1002.exr",
+        "SC_48/SH_0160/main/plate/v001/plate_1001.exr",
+        "SC_48/SH_0160/main/plate/v001/plate_1002.exr",
+    ]
+    assert unchanged == 0
+    assert summarize_delta(delta) == {"SC_48/SH_0160/main/comp/v001": 2, "SC_48/SH_0160/main/plate/v001": 2}
+    target = egress.write(delta, "gen63_vendA_20250102")
+    assert os.path.isfile(os.path.join(target, "SC_48", "SH_0160", "main", "comp", "v001", "comp_1001.exr"))
+
+    # The manifest is read back by the next egress
+    delta, unchanged = packager(sequences, "20250103").collect_delta(["SC_48/SH_0160"])
+    assert delta == [] and unchanged == 4
+
+
+def test_changed_file_is_sent_again(sequences):
+    source_root, _ = sequences
+    egress = packager(sequences)
+    egress.write(egress.collect_delta(["SC_48"])[0], "gen63_vendA_20250102")
+    comp = os.path.join(source_root, "SC_48", "SH_0160", "main", "comp", "v001", "comp_1002.exr")
+    write(comp, b"fixed comp")
+    delta, unchanged = packager(sequences, "20250103").collect_delta(["SC_48"])
+    assert [path for path, _, _ in delta] == [comp]
+    assert unchanged == 3
+
+
+def test_excluded_folders_are_left_out(sequences):
+    delta, _ = packager(sequences).collect_delta(["SC_48/SH_0160"], excluded_folders={"SC_48/SH_0160/main/plate/v001"})
+    assert [rel_path for _, rel_path, _ in delta] == [
+        "SC_48/SH_0160/main/comp/v001/comp_1001.exr",
+        "SC_48/SH_0160/main/comp/v001/comp_1002.exr",
+    ]
+    delta, unchanged = packager(sequences).collect_delta(["SC_48/SH_0160/main/plate/v001"], excluded_folders={"SC_48/SH_0160/main/plate/v001"})
+    assert delta == [] and unchanged == 0
+
+
+def test_tar_package(sequences):
+    egress = packager(sequences, fmt="tar")
+    delta, _ = egress.collect_delta(["SC_48"])
+    tar_path = egress.write(delta, "gen63_vendA_20250102")
+    assert os.path.basename(tar_path) == "gen63_vendA_20250102.tar"
+    with tarfile.open(tar_path) as tar:
+        assert tar.getnames() == [rel_path for _, rel_path, _ in delta]
+
+
+def test_failed_tar_leaves_no_package_and_no_manifest_entries(sequences):
+    source_root, vendor_root = sequences
+    egress = packager(sequences, fmt="tar")
+    delta, _ = egress.collect_delta(["SC_48"])
+    os.remove(delta[-1][0])
+    with pytest.raises(OSError):
+        egress.write(delta, "gen63_vendA_20250102")
+    assert os.listdir(os.path.join(vendor_root, "20250102")) == []
+    assert packager(sequences).manifest.entries == {}
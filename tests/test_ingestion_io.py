@@ -0,0 +1,46 @@
+import os
+import ctypes
+import errno
+
+from gargantua import ingestion_io
+from gargantua.ingestion_io import PARTIAL_SUFFIX, free_space, preallocate, tuned_copy
+
+
+def test_tuned_copy(tmp_path):
+    src = tmp_path / "plate_1001.exr"
+    src.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+    os.utime(src, ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+    dst = tmp_path / "out" / "plate_1001.exr"
+    dst.parent.mkdir()
+    assert tuned_copy(str(src), str(dst), block_size=1024 * 1024) == src.stat().st_size
+    assert dst.read_bytes() == src.read_bytes()
+    assert dst.stat().st_mtime_ns == src.stat().st_mtime_ns
+    assert not [name for name in os.listdir(dst.parent) if name.endswith(PARTIAL_SUFFIX)]
+
+
+def test_tuned_copy_of_an_empty_file(tmp_path):
+    src = tmp_path / "empty.exr"
+    src.write_bytes(b"")
+    assert tuned_copy(str(src), str(tmp_path / "copy.exr")) == 0
+    assert (tmp_path / "copy.exr").read_bytes() == b""
+
+
+def test_preallocate_skips_filesystems_without_fallocate(tmp_path, monkeypatch):
+    calls = []
+
+    def fallocate(fd, mode, offset, length):
+        calls.append(length)
+        ctypes.set_errno(errno.EOPNOTSUPP)
+        return -1
+
+    monkeypatch.setattr(ingestion_io, "_fallocate", lambda: fallocate)
+    monkeypatch.setattr(ingestion_io, "_no_fallocate_devices", set())
+    with open(tmp_path / "a", 'wb') as first, open(tmp_path / "b", 'wb') as second:
+        preallocate(first.fileno(), 4096)
+        preallocate(second.fileno(), 4096)
+    assert calls == [4096]
+    assert os.path.getsize(tmp_path / "b") == 0
+
+
+def test_free_space_of_a_folder_not_created_yet(tmp_path):
+    assert free_space(str(tmp_path / "not" / "yet")) == free_space(str(tmp_path))
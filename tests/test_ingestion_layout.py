@@ -0,0 +1,78 @@
+import os
+import json
+
+import pytest
+
+from gargantua.ingestion_layout import FolderLayout, load_layouts
+
+
+def make_delivery(root, folders):
+    for folder in folders:
+        os.makedirs(os.path.join(root, *folder.split('/')))
+    return str(root)
+
+
+def walk(layout, base_path, **kwargs):
+    return [
+        (found["scene"], found["shot"], found["resolution"], os.path.relpath(found["path"], base_path).replace(os.sep, '/'))
+        for found in layout.iter_resolution_folders(base_path, **kwargs)
+    ]
+
+
+@pytest.mark.parametrize("name, kind, groups", [
+    ("SC_48", "scene", {"scene": "48"}),
+    ("48_14", "shot", {"shot_scene": "48", "shot": "14"}),
+    ("4448x3096", "resolution", {"resolution": "4448x3096"}),
+    ("plates", None, {}),
+])
+def test_classify(name, kind, groups):
+    found_kind, found_groups = FolderLayout().classify(name)
+    assert found_kind == kind
+    assert {key: found_groups[key] for key in groups} == groups
+
+
+def test_resolution_folders_are_found_below_their_scene(tmp_path):
+    base_path = make_delivery(tmp_path, [
+        "SC_48/48_14/4448x3096",
+        "SC_48/48_21/2224x1548",
+        "SC_48/extra/48_30/4448x3096",
+        "SC_50/50_10/4448x3096",
+    ])
+    assert walk(FolderLayout(), base_path) == [
+        ("48", "14", "4448x3096", "SC_48/48_14/4448x3096"),
+        ("48", "21", "2224x1548", "SC_48/48_21/2224x1548"),
+        ("48", "30", "4448x3096", "SC_48/extra/48_30/4448x3096"),
+        ("50", "10", "4448x3096", "SC_50/50_10/4448x3096"),
+    ]
+
+
+def test_shot_of_another_scene_or_outside_a_scene_is_ignored(tmp_path):
+    base_path = make_delivery(tmp_path, [
+        "SC_48/50_10/4448x3096",
+        "48_14/4448x3096",
+    ])
+    assert walk(FolderLayout(), base_path) == []
+
+
+def test_folder_that_cannot_be_listed_is_reported_and_skipped(tmp_path):
+    base_path = make_delivery(tmp_path, ["SC_48/48_14/4448x3096", "SC_48/48_21/4448x3096"])
+    layout = FolderLayout()
+    errors = []
+
+    def list_folders(path):
+        if path.endswith("48_14"):
+            raise OSError("Input/output error")
+        return sorted((entry.name, entry.path) for entry in os.scandir(path) if entry.is_dir())
+
+    found = walk(layout, base_path, list_folders=list_folders, on_error=lambda error, *context: errors.append(context))
+    assert found == [("48", "21", "4448x3096", "SC_48/48_21/4448x3096")]
+    assert [(scene, shot) for _, scene, _, shot in errors] == [("48", "14")]
+
+
+def test_vendor_layouts_override_the_default(tmp_path):
+    config_path = tmp_path / "layouts.json"
+    config_path.write_text(json.dumps({"vendA": {"shot": r"(?P<shot_scene>\d+)-(?P<shot>\w+)"}}))
+    layouts = load_layouts(str(config_path))
+    assert layouts["vendA"].classify("48-14") == ("shot", {"shot_dir": "48-14", "shot_scene": "48", "shot": "14"})
+    assert layouts["default"].classify("48-14") == (None, {})
+    assert layouts["vendA"].classify("SC_48")[0] == "scene"
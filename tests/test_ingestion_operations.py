@@ -0,0 +1,122 @@
+import os
+import shutil
+
+import pytest
+
+from gargantua.ingestion_manifest import FileManifest, file_signature
+from gargantua.ingestion_operations import CopyFileOperation, IncrementalCopyFileOperation
+
+
+@pytest.fixture
+def frames(tmp_path):
+    """A source frame, its destination root and a fresh manifest."""
+    src = tmp_path / "in" / "plate_1001.exr"
+    src.parent.mkdir()
+    src.write_bytes(b"a" * 4096)
+    root = tmp_path / "out"
+    dst = root / "SC_48" / "SH_0160" / "plate_1001.exr"
+    manifest = FileManifest(str(tmp_path / "manifest.json"))
+    return str(src), str(root), str(dst), manifest
+
+
+def make_op(manifest, root, use_hash=False):
+    return IncrementalCopyFileOperation(CopyFileOperation(), manifest, root, use_hash)
+
+
+def check(op, src, dst):
+    return op.is_current(os.path.relpath(dst, op.root), src, file_signature(src), dst)
+
+
+def touch(path, seconds=1):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_missing_destination_is_not_current(frames):
+    src, root, dst, manifest = frames
+    assert not check(make_op(manifest, root), src, dst)
+
+
+def test_copy_without_manifest_entry_is_current(frames):
+    # Frames ingested before the manifest existed keep the source mtime
+    src, root, dst, manifest = frames
+    os.makedirs(os.path.dirname(dst))
+    shutil.copy2(src, dst)
+    assert check(make_op(manifest, root), src, dst)
+
+
+def test_recorded_frame_is_current_until_the_source_changes(frames):
+    src, root, dst, manifest = frames
+    op = make_op(manifest, root)
+    op.execute(src, dst)
+    assert check(op, src, dst)
+
+    touch(src)
+    assert not check(op, src, dst)
+
+
+def test_destination_with_another_size_is_not_current(frames):
+    src, root, dst, manifest = frames
+    op = make_op(manifest, root)
+    op.execute(src, dst)
+    with open(dst, 'r+b') as dst_file:
+        dst_file.truncate(100)
+    assert not check(op, src, dst)
+
+
+@pytest.mark.parametrize("use_hash", [False, True])
+def test_fix_in_the_middle_of_a_large_frame_is_copied(frames, use_hash):
+    src, root, dst, manifest = frames
+    with open(src, 'wb') as src_file:
+        src_file.write(os.urandom(1024 * 1024))
+    op = make_op(manifest, root, use_hash)
+    op.execute(src, dst)
+    with open(src, 'r+b') as src_file:
+        src_file.seek(500000)
+        src_file.write(b"fix")
+    touch(src)
+    assert not check(op, src, dst)
+    op.execute(src, dst)
+    assert op.changes[os.path.dirname(dst)]['changed'] == ["plate_1001.exr"]
+    with open(src, 'rb') as src_file, open(dst, 'rb') as dst_file:
+        assert src_file.read() == dst_file.read()
+
+
+def test_hash_ignores_a_reexport_with_the_same_content(frames):
+    src, root, dst, manifest = frames
+    op = make_op(manifest, root, use_hash=True)
+    op.execute(src, dst)
+    touch(src)
+    assert not check(make_op(manifest, root), src, dst)
+    assert check(op, src, dst)
+    op.execute(src, dst)
+    assert op.changes[os.path.dirname(dst)] == {'new': ["plate_1001.exr"], 'changed': [], 'unchanged': 1}
+    # The hash is recorded, the next re-export does not hash the destination again
+    assert manifest.get(os.path.relpath(dst, root))[:2] == file_signature(src)
+    assert len(manifest.get(os.path.relpath(dst, root))) == 3
+
+
+def test_overwrite_keeps_hard_links_to_the_old_frame(frames):
+    src, root, dst, manifest = frames
+    op = make_op(manifest, root)
+    op.execute(src, dst)
+    link = dst + ".link"
+    os.link(dst, link)
+    with open(src, 'ab') as src_file:
+        src_file.write(b"fix")
+    op.execute(src, dst)
+    with open(link, 'rb') as link_file:
+        assert link_file.read() == b"a" * 4096
+
+
+def test_execute_copies_only_changed_frames(frames):
+    src, root, dst, manifest = frames
+    op = make_op(manifest, root)
+    op.execute(src, dst)
+    op.execute(src, dst)
+    with open(src, 'ab') as src_file:
+        src_file.write(b"more")
+    op.execute(src, dst)
+    assert op.changes[os.path.dirname(dst)] == {'new': ["plate_1001.exr"], 'changed': ["plate_1001.exr"], 'unchanged': 1}
+    with open(src, 'rb') as src_file, open(dst, 'rb') as dst_file:
+        assert src_file.read() == dst_file.read()
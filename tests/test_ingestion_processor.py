@@ -0,0 +1,180 @@
+import os
+import glob
+import errno
+
+import pytest
+
+from gargantua.ingestion_operations import ListFoldersOperation
+from gargantua.ingestion_processor import MVLIngestionProcessor
+from gargantua.ingestion_results import load_failures
+from gargantua.ingestion_utils import IngestionError
+
+CSV = "48/14,GEN63_SC_48_SH_0160,_main_plate_v001\n48/21,GEN63_SC_48_SH_0270,_main_plate_v001\n"
+
+
+def deliver(root, vendor, date, shots=("14",), frames=3, content=b"x", csv=CSV):
+    """Writes a to_mvl delivery of 1001.. frames whose bytes start with content."""
+    scene_path = os.path.join(root, "gen63", "vault", "to_mvl", vendor, date, "SC_48")
+    os.makedirs(scene_path, exist_ok=True)
+    with open(os.path.join(scene_path, "shots.csv"), 'w') as csv_file:
+        csv_file.write(csv)
+    for shot in shots:
+        folder = os.path.join(scene_path, f"48_{shot}", "4448x3096")
+        os.makedirs(folder, exist_ok=True)
+        for frame in range(1001, 1001 + frames):
+            with open(os.path.join(folder, f"plate_{frame}.exr"), 'wb') as frame_file:
+                frame_file.write(content + str(frame).encode() * 4096)
+
+
+def ingest(root, destination, input_date, **options):
+    processor = MVLIngestionProcessor(dict(dict(
+        source=str(root), destination=str(destination), project="gen63", input_date=input_date,
+        process=1, max_workers=4, retry_delay=0.01,
+    ), **options))
+    processor.execute()
+    return processor
+
+
+def egress(root, destination, input_date, shots, **options):
+    return ingest(root, destination, input_date, process=0, vendor="vendA", egress_shots=shots, **options)
+
+
+def plates(destination, shot="0160"):
+    return sorted(glob.glob(os.path.join(destination, "gen63", "work", "sequences", "SC_48", f"SH_{shot}", "main", "plate", "v001", "*.exr")))
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    destination = tmp_path / "out"
+    destination.mkdir()
+    return tmp_path / "root", destination
+
+
+def test_batch_of_dates_keeps_the_first_delivery_of_a_shot(dirs):
+    root, destination = dirs
+    deliver(root, "vendA", "20250101", frames=40, content=b"first")
+    deliver(root, "vendA", "20250102", frames=40, content=b"second")
+    ingest(root, destination, "20250101-20250102")
+    written = plates(destination)
+    assert len(written) == 40
+    for path in written:
+        with open(path, 'rb') as plate:
+            assert plate.read(5) == b"first"
+
+
+def test_same_date_delivery_of_a_shot_by_two_vendors_is_skipped(dirs):
+    root, destination = dirs
+    deliver(root, "vendA", "20250101", shots=("14", "21"), content=b"A")
+    deliver(root, "vendB", "20250101", shots=("14",), content=b"B")
+    processor = ingest(root, destination, "20250101")
+    assert processor.skipped_shots == {("gen63", "vendB", "20250101", "48", "14")}
+    for path in plates(destination):
+        with open(path, 'rb') as plate:
+            assert plate.read(1) == b"A"
+    assert len(plates(destination, "0270")) == 3
+
+
+def sent(root, date_str="20250105"):
+    vendor_date = os.path.join(root, "gen63", "vault", "from_mvl", "vendA", date_str)
+    return sorted(
+        os.path.relpath(os.path.join(folder, name), vendor_date).replace(os.sep, '/')
+        for folder, _, names in os.walk(vendor_date) for name in names
+    )
+
+
+@pytest.mark.parametrize("shot_type, plate_folder", [
+    ("_main_plate_v001", "main/plate/v001"),
+    ("_main_v001", "main/v001"),
+])
+def test_egress_leaves_out_the_ingested_plates(dirs, shot_type, plate_folder):
+    root, destination = dirs
+    deliver(root, "vendA", "20250101", csv=f"48/14,GEN63_SC_48_SH_0160,{shot_type}\n")
+    ingest(root, destination, "20250101")
+    shot_path = os.path.join(destination, "gen63", "work", "sequences", "SC_48", "SH_0160")
+    assert len(os.listdir(os.path.join(shot_path, *plate_folder.split('/')))) == 3
+    os.makedirs(os.path.join(shot_path, "main", "comp", "v001"))
+    with open(os.path.join(shot_path, "main", "comp", "v001", "comp_1001.exr"), 'wb') as comp:
+        comp.write(b"comp")
+
+    egress(root, destination, "20250105", "SC_48/SH_0160")
+    assert sent(root) == ["SC_48/SH_0160/main/comp/v001/comp_1001.exr"]
+
+    egress(root, destination, "20250106", "SC_48/SH_0160", egress_plates=True)
+    assert len(sent(root, "20250106")) == 3
+    assert all(path.startswith(f"SC_48/SH_0160/{plate_folder}/") for path in sent(root, "20250106"))
+
+
+def test_egress_without_a_record_of_ingested_plates_fails(dirs):
+    root, destination = dirs
+    os.makedirs(os.path.join(root, "gen63"))
+    with pytest.raises(IngestionError):
+        egress(root, destination, "20250105", "SC_48/SH_0160")
+
+
+def test_space_check_plans_only_frames_not_yet_written(dirs, monkeypatch):
+    root, destination = dirs
+    deliver(root, "vendA", "20250101", shots=("14", "21"))
+    options = dict(source=str(root), destination=str(destination), project="gen63", input_date="20250101", process=1)
+    processor = MVLIngestionProcessor(options)
+    processor.prepare()
+    frame_size = len(b"x" + b"1001" * 4096)
+    assert processor.plan_total_bytes() == 6 * frame_size
+
+    monkeypatch.setattr("gargantua.ingestion_processor.free_space", lambda path: 6 * frame_size - 1)
+    with pytest.raises(IngestionError):
+        processor.check_destination_space()
+    monkeypatch.undo()
+
+    ingest(root, destination, "20250101")
+    processor = MVLIngestionProcessor(options)
+    processor.prepare()
+    assert processor.plan_total_bytes() == 0
+
+
+def failing_listing(monkeypatch, failing, error=OSError(errno.EIO, "Input/output error")):
+    """Makes folder listings whose path ends with failing raise error."""
+    list_folders = ListFoldersOperation.execute
+
+    def execute(self, path):
+        if path.endswith(failing):
+            raise error
+        return list_folders(self, path)
+
+    monkeypatch.setattr(ListFoldersOperation, "execute", execute)
+
+
+def test_shot_that_cannot_be_discovered_fails_and_reruns(dirs, monkeypatch):
+    root, destination = dirs
+    deliver(root, "vendA", "20250101", shots=("14", "21"))
+    failing_listing(monkeypatch, os.path.join("SC_48", "48_21"))
+    processor = ingest(root, destination, "20250101", retries=1)
+    assert len(plates(destination)) == 3
+    assert plates(destination, "0270") == []
+    assert processor.results[("gen63", "20250101")]["failed"] == 1
+    failures = glob.glob(os.path.join(destination, ".gargantua", "failures_*.json"))
+    assert len(failures) == 1
+    options, shots = load_failures(failures[0])
+    assert shots == {("gen63", "vendA", "20250101", "48", "21")}
+
+    monkeypatch.undo()
+    rerun = MVLIngestionProcessor({"rerun_failures": failures[0]})
+    rerun.execute()
+    assert len(plates(destination, "0270")) == 3
+    assert {result.shot for result in rerun.run_results.results} == {"21"}
+    assert rerun.run_results.failures() == []
+
+
+def test_scene_that_cannot_be_discovered_fails_and_reruns(dirs, monkeypatch):
+    root, destination = dirs
+    deliver(root, "vendA", "20250101", shots=("14", "21"))
+    failing_listing(monkeypatch, "SC_48")
+    processor = ingest(root, destination, "20250101", retries=0)
+    (failure,) = processor.run_results.failures()
+    assert (failure.scene, failure.shot, failure.stage) == ("48", None, "discovery")
+    assert processor.run_results.by_vendor()[("gen63", "vendA", "20250101")]["failed_shots"] == 1
+
+    monkeypatch.undo()
+    failures_path = glob.glob(os.path.join(destination, ".gargantua", "failures_*.json"))[0]
+    MVLIngestionProcessor({"rerun_failures": failures_path}).execute()
+    assert len(plates(destination)) == 3
+    assert len(plates(destination, "0270")) == 3
@@ -0,0 +1,134 @@
+import errno
+
+import pytest
+
+from gargantua import ingestion_retry
+from gargantua.ingestion_retry import CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A manual clock standing in for time.monotonic, advanced with clock.advance(seconds)."""
+    class Clock:
+        now = 1000.0
+
+        def advance(self, seconds):
+            self.now += seconds
+
+    clock = Clock()
+    monkeypatch.setattr(ingestion_retry.time, "monotonic", lambda: clock.now)
+    return clock
+
+
+def test_opens_after_threshold_failures(clock):
+    breaker = CircuitBreaker("/mnt/nas", threshold=3, cooldown=10)
+    for _ in range(2):
+        breaker.failure()
+        assert breaker.state == "closed"
+        assert breaker.allow()
+    breaker.failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("/mnt/nas", threshold=2, cooldown=10)
+    breaker.failure()
+    breaker.success()
+    breaker.failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_lets_one_trial_call_through(clock):
+    breaker = CircuitBreaker("/mnt/nas", threshold=1, cooldown=10)
+    breaker.failure()
+    clock.advance(9)
+    assert not breaker.allow()
+    clock.advance(1)
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    # The trial is still running, everything else keeps failing fast
+    assert not breaker.allow()
+
+
+def test_trial_success_closes(clock):
+    breaker = CircuitBreaker("/mnt/nas", threshold=1, cooldown=10)
+    breaker.failure()
+    clock.advance(10)
+    assert breaker.allow()
+    breaker.success()
+    assert breaker.state == "closed"
+    assert breaker.allow() and breaker.allow()
+
+
+def test_trial_failure_reopens_for_another_cooldown(clock):
+    breaker = CircuitBreaker("/mnt/nas", threshold=3, cooldown=10)
+    for _ in range(3):
+        breaker.failure()
+    clock.advance(10)
+    assert breaker.allow()
+    breaker.failure()
+    assert breaker.state == "open"
+    clock.advance(9)
+    assert not breaker.allow()
+    clock.advance(1)
+    assert breaker.allow()
+
+
+class FlakyOperation:
+    """Fails with the given errors, then returns "done"."""
+    name = "copy"
+    cpu_bound = False
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def execute(self, src, dst):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "done"
+
+
+def retrying(op, **kwargs):
+    return ingestion_retry.RetryingFileOperation(op, base_delay=0.001, breakers=ingestion_retry.CircuitBreakers(threshold=10), **kwargs)
+
+
+def test_transient_errors_are_retried(tmp_path):
+    op = FlakyOperation(OSError(errno.EIO, "I/O error"), TimeoutError())
+    retry = retrying(op, retries=3)
+    assert retry.execute(str(tmp_path / "a"), str(tmp_path / "b")) == "done"
+    assert op.calls == 3 and retry.retried == 2
+
+
+def test_other_errors_are_raised_at_once(tmp_path):
+    op = FlakyOperation(FileNotFoundError(errno.ENOENT, "missing"))
+    with pytest.raises(FileNotFoundError):
+        retrying(op).execute(str(tmp_path / "a"), str(tmp_path / "b"))
+    assert op.calls == 1
+
+
+def test_retries_run_out(tmp_path):
+    op = FlakyOperation(*(OSError(errno.EIO, "I/O error") for _ in range(3)))
+    with pytest.raises(OSError):
+        retrying(op, retries=2).execute(str(tmp_path / "a"), str(tmp_path / "b"))
+    assert op.calls == 3
+
+
+def test_call_runs_other_reads_with_the_same_retries(tmp_path):
+    op = FlakyOperation(OSError(errno.ESTALE, "stale"))
+    retry = retrying(FlakyOperation(), retries=1)
+    assert retry.call(op.execute, str(tmp_path / "a"), str(tmp_path / "b")) == "done"
+    assert op.calls == 2
+
+
+def test_open_breaker_fails_fast(tmp_path):
+    breakers = ingestion_retry.CircuitBreakers(threshold=1, cooldown=60)
+    op = FlakyOperation(OSError(errno.EIO, "I/O error"))
+    retry = ingestion_retry.RetryingFileOperation(op, retries=3, base_delay=0.001, breakers=breakers)
+    with pytest.raises(OSError):
+        retry.execute(str(tmp_path / "a"), str(tmp_path / "b"))
+    with pytest.raises(ingestion_retry.MountUnavailableError):
+        retry.execute(str(tmp_path / "a"), str(tmp_path / "b"))
+    assert op.calls == 1
@@ -0,0 +1,70 @@
+import threading
+
+from gargantua.ingestion_scheduler import PriorityScheduler, INTERACTIVE_PRIORITY, DEFAULT_PRIORITY
+
+
+def run_queued(submissions):
+    """
+    Queues tasks behind a blocked single worker, then releases it.
+
+    Args:
+        submissions (list): (name, priority, cost) per task, in submission order.
+
+    Returns:
+        list: The task names in the order they ran.
+    """
+    order = []
+    release = threading.Event()
+    with PriorityScheduler(max_workers=1) as scheduler:
+        scheduler.submit(release.wait)
+        futures = [
+            scheduler.submit(order.append, name, priority=priority, cost=cost)
+            for name, priority, cost in submissions
+        ]
+        release.set()
+    for future in futures:
+        future.result()
+    return order
+
+
+def test_priority_runs_first():
+    order = run_queued([
+        ("bulk", DEFAULT_PRIORITY, 0),
+        ("editorial", INTERACTIVE_PRIORITY, 0),
+        ("csv", 50, 0),
+    ])
+    assert order == ["editorial", "csv", "bulk"]
+
+
+def test_smallest_cost_first_within_a_priority():
+    order = run_queued([
+        ("large", DEFAULT_PRIORITY, 300),
+        ("small", DEFAULT_PRIORITY, 10),
+        ("medium", DEFAULT_PRIORITY, 200),
+    ])
+    assert order == ["small", "medium", "large"]
+
+
+def test_submission_order_breaks_ties():
+    order = run_queued([(name, DEFAULT_PRIORITY, 5) for name in "abcd"])
+    assert order == list("abcd")
+
+
+def test_max_pending_blocks_submit():
+    release = threading.Event()
+    scheduler = PriorityScheduler(max_workers=1, max_pending=1)
+    scheduler.submit(release.wait)
+    submitted = threading.Event()
+    producer = threading.Thread(target=lambda: (scheduler.submit(int), submitted.set()))
+    producer.start()
+    assert not submitted.wait(0.2)
+    release.set()
+    assert submitted.wait(5)
+    producer.join()
+    scheduler.shutdown()
+
+
+def test_exceptions_are_set_on_the_future():
+    with PriorityScheduler(max_workers=1) as scheduler:
+        future = scheduler.submit(int, "not a number")
+    assert isinstance(future.exception(), ValueError)
@@ -0,0 +1,84 @@
+import pytest
+
+from gargantua.ingestion_sequences import FrameGroup, split_frame_name
+
+
+@pytest.mark.parametrize("file_name, expected", [
+    ("plate_1001.exr", ("plate", "_", "1001", "exr")),
+    ("plate.1001.exr", ("plate", ".", "1001", "exr")),
+    ("GEN63_SC_48_main.0042.dpx", ("GEN63_SC_48_main", ".", "0042", "dpx")),
+    ("a_b_7.jpg", ("a_b", "_", "7", "jpg")),
+])
+def test_split_frame_name(file_name, expected):
+    assert split_frame_name(file_name) == expected
+
+
+@pytest.mark.parametrize("file_name", [
+    "notes.txt",  # no frame number
+    "1001.exr",  # no base name
+    "_1001.exr",  # separator only
+    "plate1001.exr",  # no separator
+    "plate_1001",  # no extension
+    "plate_1001.",  # empty extension
+    "plate_1001.ex-r",  # extension is not alphanumeric
+    "plate_v1.exr",  # digits after a letter, not a separator
+])
+def test_split_frame_name_rejects_non_frames(file_name):
+    assert split_frame_name(file_name) is None
+
+
+def make_group(digits):
+    group = FrameGroup("plate", "_", "exr")
+    for frame in digits:
+        group.add(frame, f"/in/plate_{frame}.exr")
+    return group
+
+
+def test_frame_group_merges_ranges_added_out_of_order():
+    group = make_group(["1003", "1001", "1005", "1002", "1004"])
+    assert group.ranges() == [(1001, 1005)]
+    sequence = group.to_sequence()
+    assert sequence['start'] == 1001 and sequence['end'] == 1005
+    assert sequence['gaps'] == []
+    assert sequence['paths'] == [f"/in/plate_{frame}.exr" for frame in range(1001, 1006)]
+
+
+def test_frame_group_reports_gaps():
+    group = make_group(["1001", "1002", "1005", "1009", "1010"])
+    assert group.ranges() == [(1001, 1002), (1005, 1005), (1009, 1010)]
+    sequence = group.to_sequence()
+    assert sequence['gaps'] == [(1003, 1004), (1006, 1008)]
+    assert sequence['start'] == 1001 and sequence['end'] == 1010
+
+
+def test_frame_group_joins_ranges_bridged_by_a_frame():
+    group = make_group(["1001", "1003"])
+    assert group.ranges() == [(1001, 1001), (1003, 1003)]
+    group.add("1002", "/in/plate_1002.exr")
+    assert group.ranges() == [(1001, 1003)]
+
+
+def test_frame_group_padding():
+    group = make_group(["0998", "0999", "1000", "1001"])
+    assert group.padding == 4
+    assert group.padding_consistent
+
+    unpadded = make_group(["8", "9", "10", "11"])
+    assert unpadded.padding == 1
+    assert unpadded.padding_consistent
+
+
+def test_frame_group_inconsistent_padding():
+    group = make_group(["0099", "00100"])
+    assert not group.padding_consistent
+
+    short = make_group(["0999", "100"])
+    assert not short.padding_consistent
+
+
+def test_frame_group_duplicate_frame_numbers():
+    group = make_group(["1001", "1002"])
+    group.add("01001", "/in/plate_01001.exr")
+    assert group.duplicates == ["/in/plate_01001.exr"]
+    assert len(group.frames) == 2
+    assert not group.padding_consistent
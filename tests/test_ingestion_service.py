@@ -0,0 +1,77 @@
+import os
+import glob
+import asyncio
+
+import pytest
+
+from gargantua.ingestion_service import IngestJobConfig, IngestionService, IngestionError
+
+CSV = "48/14,GEN63_SC_48_SH_0160,_main_plate_v001\n"
+
+
+def deliver(root, vendor, date, frames=3):
+    folder = os.path.join(root, "gen63", "vault", "to_mvl", vendor, date, "SC_48", "48_14", "4448x3096")
+    os.makedirs(folder)
+    with open(os.path.join(root, "gen63", "vault", "to_mvl", vendor, date, "SC_48", "shots.csv"), 'w') as csv_file:
+        csv_file.write(CSV)
+    for frame in range(1001, 1001 + frames):
+        with open(os.path.join(folder, f"plate_{frame}.exr"), 'wb') as frame_file:
+            frame_file.write(str(frame).encode() * 1024)
+
+
+def plates(destination):
+    return glob.glob(os.path.join(destination, "gen63", "work", "sequences", "SC_48", "SH_0160", "main", "plate", "v001", "*.exr"))
+
+
+@pytest.fixture
+def service():
+    with IngestionService(max_workers=4, max_jobs=2) as service:
+        yield service
+
+
+def test_jobs_share_the_service(tmp_path, service):
+    root = tmp_path / "root"
+    deliver(root, "vendA", "20250101")
+    configs = [
+        IngestJobConfig(destination=str(tmp_path / name), input_date="20250101", source=str(root))
+        for name in ("out1", "out2")
+    ]
+    futures = [service.submit(config) for config in configs]
+    assert [future.job_id for future in futures] == [1, 2]
+    for future, config in zip(futures, configs):
+        future.result(timeout=60)
+        assert len(plates(config.destination)) == 3
+
+
+def test_failed_job_raises_ingestion_error(tmp_path, service):
+    os.makedirs(tmp_path / "root" / "gen63")
+    config = IngestJobConfig(
+        destination=str(tmp_path / "out"), input_date="20250105", source=str(tmp_path / "root"),
+        process=0, vendor="vendA", egress_shots="SC_48/SH_0160",
+    )
+    with pytest.raises(IngestionError):
+        service.submit(config).result(timeout=60)
+
+
+def test_events_of_a_job_end_with_its_result(tmp_path, service):
+    root = tmp_path / "root"
+    deliver(root, "vendA", "20250101")
+    config = IngestJobConfig(destination=str(tmp_path / "out"), input_date="20250101", source=str(root))
+
+    async def run():
+        events = []
+
+        async def consume():
+            async for event in service.events(job_id=1):
+                events.append(event)
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        results = await service.run(config)
+        await asyncio.wait_for(consumer, timeout=60)
+        return results, events
+
+    results, events = asyncio.run(run())
+    assert events[0]["event"] == "job_started"
+    assert events[-1] == {"event": "job_finished", "job_id": 1, "results": results}
+    assert all(event["job_id"] == 1 for event in events)
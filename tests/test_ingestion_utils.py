@@ -0,0 +1,31 @@
+import pytest
+
+from gargantua.ingestion_utils import parse_input_dates
+
+
+def test_single_date():
+    assert parse_input_dates("20250101") == ["20250101"]
+
+
+def test_list_is_sorted_and_unique():
+    assert parse_input_dates("20250103, 20250101,20250103") == ["20250101", "20250103"]
+
+
+def test_range_is_inclusive_and_crosses_months():
+    assert parse_input_dates("20250130-20250202") == ["20250130", "20250131", "20250201", "20250202"]
+
+
+def test_ranges_and_lists_mixed():
+    assert parse_input_dates("20250110,20250101-20250103,20250102-20250104") == [
+        "20250101", "20250102", "20250103", "20250104", "20250110",
+    ]
+
+
+def test_empty():
+    assert parse_input_dates("") == []
+
+
+@pytest.mark.parametrize("value", ["2025-01-01", "20250132", "20250105-20250101", "tomorrow"])
+def test_invalid(value):
+    with pytest.raises(ValueError):
+        parse_input_dates(value)